@@ -1,5 +1,6 @@
 from utils.abstract_bot import AbstractBot
 from utils.moves import Move
+from utils.strategy_table import StrategyTable, MemoryOne
 from typing import List
 
 class AlwaysCooperateBot(AbstractBot):
@@ -12,4 +13,16 @@ class AlwaysCooperateBot(AbstractBot):
         return "A bot that always cooperates"
     
     def strategy(self, my_history: List[Move], opponent_history: List[Move], current_round: int, total_rounds: int) -> Move:
-        return self.cooperate
\ No newline at end of file
+        return self.cooperate
+    
+    def move_schedule(self, rounds: int) -> List[Move]:
+        return [self.cooperate] * rounds
+    
+    def strategy_table(self, rounds: int) -> StrategyTable:
+        return StrategyTable.constant(Move.COOPERATE)
+    
+    def memory_one(self) -> MemoryOne:
+        return MemoryOne(first=1, cc=1, cd=1, dc=1, dd=1)
+    
+    def state_key(self):
+        return 0
\ No newline at end of file
@@ -1,5 +1,6 @@
 from utils.abstract_bot import AbstractBot
 from utils.moves import Move
+from utils.strategy_table import StrategyTable, MemoryOne
 from typing import List
 
 class AlwaysDefectBot(AbstractBot):
@@ -12,4 +13,16 @@ class AlwaysDefectBot(AbstractBot):
         return "A bot that always defects"
     
     def strategy(self, my_history: List[Move], opponent_history: List[Move], current_round: int, total_rounds: int) -> Move:
-        return self.defect
\ No newline at end of file
+        return self.defect
+    
+    def move_schedule(self, rounds: int) -> List[Move]:
+        return [self.defect] * rounds
+    
+    def strategy_table(self, rounds: int) -> StrategyTable:
+        return StrategyTable.constant(Move.DEFECT)
+    
+    def memory_one(self) -> MemoryOne:
+        return MemoryOne(first=0, cc=0, cd=0, dc=0, dd=0)
+    
+    def state_key(self):
+        return 0
\ No newline at end of file
@@ -1,12 +1,9 @@
 from utils.abstract_bot import AbstractBot
 from utils.moves import Move
+from utils.strategy_table import StrategyTable, MemoryOne
 from typing import List
 
 class GrudgeBot(AbstractBot):
-    def __init__(self):
-        super().__init__()  # Add this line to initialize parent class
-        self.been_betrayed = False
-    
     @property
     def name(self) -> str:
         return "Grudge Bot"
@@ -16,10 +13,18 @@ class GrudgeBot(AbstractBot):
         return "A bot that never forgives betrayal"
     
     def strategy(self, my_history: List[Move], opponent_history: List[Move], current_round: int, total_rounds: int) -> Move:
-        if not opponent_history:
-            return self.cooperate
-            
-        if not self.been_betrayed and opponent_history[-1] == Move.DEFECT:
-            self.been_betrayed = True
-            
-        return self.defect if self.been_betrayed else self.cooperate
\ No newline at end of file
+        return self.defect if self.history_stats.opponent_has_defected else self.cooperate
+    
+    def strategy_table(self, rounds: int) -> StrategyTable:
+        # State 1 (betrayed) is never left
+        return StrategyTable(
+            moves=[Move.COOPERATE, Move.DEFECT],
+            transitions=[{Move.COOPERATE: 0, Move.DEFECT: 1},
+                         {Move.COOPERATE: 1, Move.DEFECT: 1}])
+    
+    def memory_one(self) -> MemoryOne:
+        # Having defected means the opponent defected before, so the grudge is already held
+        return MemoryOne(first=1, cc=1, cd=0, dc=0, dd=0)
+    
+    def state_key(self):
+        return self.history_stats.opponent_has_defected
\ No newline at end of file
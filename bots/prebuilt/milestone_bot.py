@@ -1,5 +1,6 @@
 from utils.abstract_bot import AbstractBot
 from utils.moves import Move
+from utils.strategy_table import StrategyTable
 from typing import List
 
 class MilestoneBot(AbstractBot):
@@ -27,3 +28,10 @@ class MilestoneBot(AbstractBot):
         if self.is_milestone_round(current_round):
             return self.defect
         return self.cooperate
+    
+    def move_schedule(self, rounds: int) -> List[Move]:
+        return [self.defect if self.is_milestone_round(current_round) else self.cooperate
+                for current_round in range(1, rounds + 1)]
+    
+    def strategy_table(self, rounds: int) -> StrategyTable:
+        return StrategyTable.from_schedule(self.move_schedule(rounds))
\ No newline at end of file
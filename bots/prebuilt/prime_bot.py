@@ -1,5 +1,6 @@
 from utils.abstract_bot import AbstractBot
 from utils.moves import Move
+from utils.strategy_table import StrategyTable
 from typing import List
 from math import sqrt
 
@@ -22,3 +23,10 @@ class PrimeBot(AbstractBot):
     
     def strategy(self, my_history: List[Move], opponent_history: List[Move], current_round: int, total_rounds: int) -> Move:
         return self.cooperate if self.is_prime(current_round) else self.defect
+    
+    def move_schedule(self, rounds: int) -> List[Move]:
+        return [self.cooperate if self.is_prime(current_round) else self.defect
+                for current_round in range(1, rounds + 1)]
+    
+    def strategy_table(self, rounds: int) -> StrategyTable:
+        return StrategyTable.from_schedule(self.move_schedule(rounds))
\ No newline at end of file
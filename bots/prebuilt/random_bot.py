@@ -1,7 +1,7 @@
 from utils.abstract_bot import AbstractBot
 from utils.moves import Move
+from utils.strategy_table import MemoryOne
 from typing import List
-import random
 
 class RandomBot(AbstractBot):
     @property
@@ -13,4 +13,7 @@ class RandomBot(AbstractBot):
         return "A bot that makes random decisions"
     
     def strategy(self, my_history: List[Move], opponent_history: List[Move], current_round: int, total_rounds: int) -> Move:
-        return random.choice([self.cooperate, self.defect])
\ No newline at end of file
+        return self.random.choice([self.cooperate, self.defect])
+    
+    def memory_one(self) -> MemoryOne:
+        return MemoryOne(first=0.5, cc=0.5, cd=0.5, dc=0.5, dd=0.5)
\ No newline at end of file
@@ -1,5 +1,6 @@
 from utils.abstract_bot import AbstractBot
 from utils.moves import Move
+from utils.strategy_table import StrategyTable, MemoryOne
 from typing import List
 
 class TitForTatBot(AbstractBot):
@@ -14,4 +15,16 @@ class TitForTatBot(AbstractBot):
     def strategy(self, my_history: List[Move], opponent_history: List[Move], current_round: int, total_rounds: int) -> Move:
         if not opponent_history:
             return self.cooperate
-        return opponent_history[-1]
\ No newline at end of file
+        return opponent_history[-1]
+    
+    def strategy_table(self, rounds: int) -> StrategyTable:
+        # State 0 plays COOPERATE, state 1 plays DEFECT; the next state copies the opponent
+        return StrategyTable(
+            moves=[Move.COOPERATE, Move.DEFECT],
+            transitions=[{Move.COOPERATE: 0, Move.DEFECT: 1}] * 2)
+    
+    def memory_one(self) -> MemoryOne:
+        return MemoryOne(first=1, cc=1, cd=0, dc=1, dd=0)
+    
+    def state_key(self):
+        return self.opponent_history[-1]
\ No newline at end of file
@@ -0,0 +1,190 @@
+import argparse
+import os
+from simulation.match_record import MatchRecordReader, convert_log_directory, convert_text_log
+from simulation.match_log import render_match_record
+from simulation.match_cache import MatchCache
+from simulation.simulate_tournament import TournamentSimulation
+from simulation.replicates import ReplicateTournament
+from simulation.horizons import MultiHorizonTournament
+from simulation.sweep import ParameterSweep
+from simulation.events import TournamentStream
+from simulation.sandbox import BotSandbox, TIMEOUT_POLICIES
+from utils.game_config import GameConfig
+
+
+def convert_command(args):
+    if args.path.endswith('.txt'):
+        print(f"Wrote {convert_text_log(args.path)}")
+    else:
+        converted = convert_log_directory(args.path, remove_text=args.remove)
+        print(f"Converted {converted} match logs in {args.path}")
+
+
+def render_command(args):
+    with MatchRecordReader(args.path) as reader:
+        if args.match:
+            print(render_match_record(reader.find(*args.match)))
+            return
+
+        output_dir = args.output or os.path.dirname(os.path.abspath(args.path))
+        os.makedirs(output_dir, exist_ok=True)
+        for record in reader:
+            with open(os.path.join(output_dir, f"{record.bot1}_vs_{record.bot2}.txt"), 'w') as f:
+                f.write(render_match_record(record))
+        print(f"Rendered {len(reader)} match logs to {output_dir}")
+
+
+def collect_bot_paths(paths):
+    """Expand directories into the bot files they contain."""
+    bot_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            bot_paths.extend(sorted(entry.path for entry in os.scandir(path)
+                                    if entry.is_file() and entry.name.endswith('.py') and not entry.name.startswith('__')))
+        else:
+            bot_paths.append(path)
+    return bot_paths
+
+
+def tournament_command(args):
+    if args.sandbox:
+        with BotSandbox(budget=args.decision_budget / 1000, on_timeout=args.on_timeout) as sandbox:
+            run_tournament(args, sandbox)
+    else:
+        run_tournament(args)
+
+
+def run_tournament(args, sandbox=None):
+    simulation = TournamentSimulation(log_format=args.log_format, time_decisions=not args.no_timing, sandbox=sandbox)
+    cache = MatchCache() if args.cache else None
+    options = dict(rounds=args.rounds, workers=args.workers or None, cache=cache, seed=args.seed,
+                   previous=args.previous)
+    if args.stream:
+        stream = TournamentStream(simulation, collect_bot_paths(args.bots), **options)
+        for event in stream:
+            print(f"[{event.done}/{event.total}] {event.bot1} vs {event.bot2}: {event.score1} - {event.score2}")
+        tournament_dir = stream.directory
+    else:
+        tournament_dir = simulation.run_all_against_all(collect_bot_paths(args.bots), **options)
+    if args.previous:
+        print(f"Reused {simulation.reused_matches} matches from {args.previous}")
+    if cache is not None:
+        print(f"Match cache: {cache.hits} hits, {cache.misses} misses")
+    print(f"Tournament results written to {tournament_dir}")
+
+
+def replicates_command(args):
+    tournament = ReplicateTournament(collect_bot_paths(args.bots), rounds=args.rounds, seed=args.seed,
+                                     workers=args.workers or None, confidence=args.confidence)
+    if args.adaptive:
+        directory = tournament.run_adaptive(max_replicates=args.replicates, min_replicates=args.min_replicates)
+        print(f"Played {tournament.matches_played} matches, "
+              f"{tournament.fixed_matches - tournament.matches_played} fewer than {args.replicates} replicates")
+    else:
+        directory = tournament.run(args.replicates)
+        print(f"Played {tournament.matches_played} matches "
+              f"({len(tournament.deterministic)} deterministic pairings played once)")
+    print(f"Replicate results written to {directory}")
+
+
+def horizons_command(args):
+    tournament = MultiHorizonTournament(collect_bot_paths(args.bots), args.horizons, seed=args.seed,
+                                        workers=args.workers or None)
+    directory = tournament.run()
+    print(f"Played {tournament.matches_played} matches for {len(tournament.horizons)} horizons")
+    print(f"Horizon results written to {directory}")
+
+
+def parse_grid_setting(text):
+    """Parse NAME=VALUE1,VALUE2,... into (name, values) for a GameConfig setting.
+
+    Numbers are ints when they are whole and floats otherwise, so payoffs may be
+    fractional; NUMBER_OF_ROUNDS must be whole.
+    """
+    name, _, values = text.partition('=')
+    name = name.strip().upper()
+    if not values or not name.isupper() or not hasattr(GameConfig, name):
+        raise argparse.ArgumentTypeError(f"Expected SETTING=VALUE,... with a GameConfig setting, got {text!r}")
+    default = getattr(GameConfig, name)
+    if isinstance(default, bool):
+        return name, [value.strip().lower() in ('1', 'true', 'yes') for value in values.split(',')]
+    try:
+        numbers = [float(value) for value in values.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid value for {name}: {values!r}")
+    numbers = [int(number) if number.is_integer() else number for number in numbers]
+    if name == 'NUMBER_OF_ROUNDS' and not all(isinstance(number, int) for number in numbers):
+        raise argparse.ArgumentTypeError(f"{name} must be a whole number, got {values!r}")
+    return name, numbers
+
+
+def sweep_command(args):
+    sweep = ParameterSweep(collect_bot_paths(args.bots), dict(args.grid or []), seed=args.seed,
+                           workers=args.workers or None)
+    directory = sweep.run()
+    print(f"Played {sweep.matches_played} matches for {len(sweep.configs)} configurations")
+    print(f"Sweep results written to {directory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prisoner's Dilemma command line tools")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = subparsers.add_parser('convert', help="Convert text match logs to binary match records")
+    convert_parser.add_argument('path', help="A _vs_ match log or a directory to convert recursively")
+    convert_parser.add_argument('--remove', action='store_true', help="Delete the text logs after converting them")
+    convert_parser.set_defaults(func=convert_command)
+
+    render_parser = subparsers.add_parser('render', help="Render text match logs from binary match records")
+    render_parser.add_argument('path', help="A match record file or a matches archive")
+    render_parser.add_argument('--match', nargs=2, metavar=('BOT1', 'BOT2'), help="Print the log of a single match")
+    render_parser.add_argument('--output', help="Directory for the rendered logs (default: next to the records)")
+    render_parser.set_defaults(func=render_command)
+
+    tournament_parser = subparsers.add_parser('tournament', help="Run a round-robin tournament")
+    tournament_parser.add_argument('bots', nargs='+', help="Bot files or directories of bot files")
+    tournament_parser.add_argument('--rounds', type=int, default=GameConfig.NUMBER_OF_ROUNDS, help="Rounds per match")
+    tournament_parser.add_argument('--workers', type=int, default=1, help="Number of worker processes (0 for one per CPU)")
+    tournament_parser.add_argument('--log-format', choices=['text', 'binary', 'lazy'], default='lazy', help="How match logs are written")
+    tournament_parser.add_argument('--previous', help="Earlier tournament directory; only new or changed bots are replayed (with its seed by default)")
+    tournament_parser.add_argument('--seed', type=int, help="Seed for reproducible tournaments")
+    tournament_parser.add_argument('--cache', action='store_true', help="Reuse match results from the on-disk cache (needs --seed)")
+    tournament_parser.add_argument('--stream', action='store_true', help="Print every match result as it finishes")
+    tournament_parser.add_argument('--no-timing', action='store_true', help="Do not measure how long bots take to decide")
+    tournament_parser.add_argument('--sandbox', action='store_true', help="Play bots from bots/user-created in worker processes with a time budget")
+    tournament_parser.add_argument('--decision-budget', type=float, default=50, help="Milliseconds a sandboxed bot has per decision")
+    tournament_parser.add_argument('--on-timeout', choices=TIMEOUT_POLICIES, default='defect', help="Defect for a late decision, or forfeit the rest of the match")
+    tournament_parser.set_defaults(func=tournament_command)
+
+    replicates_parser = subparsers.add_parser('replicates', help="Play a tournament many times and report confidence intervals")
+    replicates_parser.add_argument('bots', nargs='+', help="Bot files or directories of bot files")
+    replicates_parser.add_argument('--replicates', type=int, default=30, help="Number of times to play the tournament (the maximum with --adaptive)")
+    replicates_parser.add_argument('--adaptive', action='store_true', help="Stop replaying pairings once the ranking is settled")
+    replicates_parser.add_argument('--min-replicates', type=int, default=5, help="Replicates of every random pairing before stopping early")
+    replicates_parser.add_argument('--rounds', type=int, default=GameConfig.NUMBER_OF_ROUNDS, help="Rounds per match")
+    replicates_parser.add_argument('--workers', type=int, default=0, help="Number of worker processes (0 for one per CPU)")
+    replicates_parser.add_argument('--seed', type=int, default=0, help="Seed of the replicate random streams")
+    replicates_parser.add_argument('--confidence', type=float, default=0.95, help="Confidence level of the intervals")
+    replicates_parser.set_defaults(func=replicates_command)
+
+    horizons_parser = subparsers.add_parser('horizons', help="Rank bots at several match lengths from one run")
+    horizons_parser.add_argument('bots', nargs='+', help="Bot files or directories of bot files")
+    horizons_parser.add_argument('--horizons', type=int, nargs='+', default=[100, 150, 200, 500], help="Match lengths to evaluate")
+    horizons_parser.add_argument('--workers', type=int, default=1, help="Number of worker processes (0 for one per CPU)")
+    horizons_parser.add_argument('--seed', type=int, default=0, help="Seed of the match random streams")
+    horizons_parser.set_defaults(func=horizons_command)
+
+    sweep_parser = subparsers.add_parser('sweep', help="Run a tournament for every combination of game settings")
+    sweep_parser.add_argument('bots', nargs='+', help="Bot files or directories of bot files")
+    sweep_parser.add_argument('--grid', type=parse_grid_setting, action='append', metavar='SETTING=VALUES',
+                              help="GameConfig setting and comma-separated values, e.g. BETRAYAL_POINTS=5,6,7 (repeatable)")
+    sweep_parser.add_argument('--workers', type=int, default=1, help="Number of worker processes (0 for one per CPU)")
+    sweep_parser.add_argument('--seed', type=int, default=0, help="Seed of the match random streams")
+    sweep_parser.set_defaults(func=sweep_command)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import queue
+import threading
+import time
+
+
+class BackgroundRun:
+    """Run a simulation in a worker thread and hand its progress to the Tk main loop.
+
+    work(progress, cancel) runs in the thread and is expected to call progress with a
+    MatchEvent after every match and to stop starting matches once cancel (a
+    threading.Event) is set. Events go through a queue that the Tk loop polls, so all
+    callbacks run on the main thread: on_progress(event, eta_seconds) for every match,
+    then on_done(result) with the return value of work, or on_error(exception).
+    """
+    POLL_INTERVAL = 100  # Milliseconds between polls of the event queue
+
+    def __init__(self, widget, work, on_progress, on_done, on_error):
+        self.widget = widget
+        self.work = work
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancel_event = threading.Event()
+        self.events = queue.Queue()
+        self.started = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.started = time.monotonic()
+        self.thread.start()
+        self.widget.after(self.POLL_INTERVAL, self._poll)
+
+    def cancel(self):
+        """Ask the simulation to stop starting new matches."""
+        self.cancel_event.set()
+
+    def _run(self):
+        try:
+            result = self.work(self._progress, self.cancel_event)
+        except Exception as e:
+            self.events.put(('error', e))
+        else:
+            self.events.put(('done', result))
+
+    def _progress(self, event):
+        self.events.put(('progress', event))
+
+    def _poll(self):
+        # The screen may have been left while the simulation was running
+        if not self.widget.winfo_exists():
+            self.cancel()
+            return
+
+        while True:
+            try:
+                kind, value = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                elapsed = time.monotonic() - self.started
+                eta = elapsed / value.done * (value.total - value.done) if value.done else None
+                self.on_progress(value, eta)
+            elif kind == 'done':
+                self.on_done(value)
+                return
+            else:
+                self.on_error(value)
+                return
+        self.widget.after(self.POLL_INTERVAL, self._poll)
@@ -1,10 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
-import importlib.util
-from utils.abstract_bot import AbstractBot
+from utils.bot_loader import load_bot
 from simulation.simulate_tournament import TournamentSimulation
 from simulation.simulate_games import PrisonersDilemmaSimulation
+from .background import BackgroundRun
 from .shared_style import Style
 
 class GameUI:
@@ -13,6 +13,7 @@ class GameUI:
         self.tooltip = None
         self.tooltip_id = None
         self.current_item = -1
+        self.background_run = None  # Simulation running in a worker thread
         
         # Add mode detection based on window title
         self.mode = "game"  # default mode
@@ -296,12 +297,87 @@ class GameUI:
 
         # Update info label
         info_label = ttk.Label(self.center_frame,
-                             text="Complete results will be saved in the logs subdirectory",
+                             text="Summaries are saved in the logs subdirectory, with the moves of every match in "
+                                  "matches.pdr (turn it into match logs with: python cli.py render <path to matches.pdr>)",
                              font=Style.FONTS['text'],
                              foreground=Style.COLORS['text'],
                              background=Style.COLORS['bg'])
         info_label.grid(row=2, column=0, columnspan=2, sticky="ew", padx=5, pady=(0, 5))
 
+        # Progress of a running simulation and the button that stops it
+        progress_frame = tk.Frame(self.center_frame, bg=Style.COLORS['bg'])
+        progress_frame.grid(row=3, column=0, columnspan=2, sticky="ew", padx=5, pady=(0, 5))
+        progress_frame.grid_columnconfigure(0, weight=1)
+        self.progress_label = ttk.Label(progress_frame,
+                                        text="",
+                                        font=Style.FONTS['text'],
+                                        foreground=Style.COLORS['text'],
+                                        background=Style.COLORS['bg'])
+        self.progress_label.grid(row=0, column=0, sticky="w")
+        self.cancel_button = tk.Button(progress_frame,
+                                       text="Cancel",
+                                       command=self.cancel_run,
+                                       state=tk.DISABLED,
+                                       **Style.button_style())
+        self.cancel_button.grid(row=0, column=1)
+        self.cancel_button.bind('<Enter>', lambda e: self.cancel_button.configure(bg=Style.COLORS['button_hover']))
+        self.cancel_button.bind('<Leave>', lambda e: self.cancel_button.configure(bg=Style.COLORS['button']))
+
+    def run_in_background(self, work, on_done, on_error, on_event=None):
+        """Run work(progress, cancel) in a worker thread, showing its progress in the log frame.
+
+        on_event(event), if given, is called on the Tk thread with every MatchEvent, and
+        on_done(result) or on_error(exception) when the run ends.
+        """
+        if self.background_run is not None:
+            return
+
+        def done(result):
+            self.finish_run()
+            on_done(result)
+
+        def failed(error):
+            self.finish_run()
+            on_error(error)
+
+        def progress(event, eta):
+            self.show_progress(event, eta)
+            if on_event is not None:
+                on_event(event)
+
+        self.background_run = BackgroundRun(self.log_text, work, progress, done, failed)
+        self.progress_label.configure(text="Starting...")
+        self.cancel_button.configure(state=tk.NORMAL)
+        self.background_run.start()
+
+    def show_progress(self, event, eta):
+        eta_text = f", about {eta:.0f}s left" if eta is not None else ""
+        self.progress_label.configure(text=f"{event.done}/{event.total} matches{eta_text} | "
+                                           f"Last: {event.bot1} vs {event.bot2} ({event.score1} - {event.score2})")
+
+    def cancel_run(self):
+        """Stop starting new matches; the results of finished matches are still shown."""
+        if self.background_run is not None:
+            self.background_run.cancel()
+            self.progress_label.configure(text="Cancelling after the current matches...")
+            self.cancel_button.configure(state=tk.DISABLED)
+
+    def finish_run(self):
+        self.background_run = None
+        self.progress_label.configure(text="")
+        self.cancel_button.configure(state=tk.DISABLED)
+
+    def show_summary(self, summary_path, cancelled):
+        """Show a summary file, noting if the run was cancelled before it finished."""
+        if not os.path.exists(summary_path):
+            self.update_log("Cancelled before any match finished.\n")
+            return
+        with open(summary_path, 'r') as f:
+            summary = f.read()
+        if cancelled:
+            summary = "Cancelled - results of the matches finished so far:\n\n" + summary
+        self.update_log(summary)
+
     def update_log(self, text):
         self.log_text.delete(1.0, tk.END)
         
@@ -403,27 +479,12 @@ class GameUI:
         if filepath:
             try:
                 # Try to load the bot to verify it's valid
-                spec = importlib.util.spec_from_file_location("custom_bot", filepath)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                
-                # Find the bot class
-                bot_class = None
-                for item in dir(module):
-                    obj = getattr(module, item)
-                    if isinstance(obj, type) and issubclass(obj, AbstractBot) and obj != AbstractBot:
-                        bot_class = obj
-                        break
-                
-                if bot_class:
-                    bot_instance = bot_class()
-                    display_name = f"{bot_instance.name} (Custom)"
-                    self.filename_to_display[display_name] = filepath
-                    self.bot_paths.append(filepath)  # Add to bot paths
-                    if self.show_custom.get():  # Only add to listbox if custom bots are shown
-                        self.bot_listbox.insert(tk.END, display_name)
-                else:
-                    messagebox.showerror("Error", "No valid bot class found in file")
+                bot_instance = load_bot(filepath)
+                display_name = f"{bot_instance.name} (Custom)"
+                self.filename_to_display[display_name] = filepath
+                self.bot_paths.append(filepath)  # Add to bot paths
+                if self.show_custom.get():  # Only add to listbox if custom bots are shown
+                    self.bot_listbox.insert(tk.END, display_name)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load bot: {str(e)}")
 
@@ -483,17 +544,9 @@ class GameUI:
         for entry in os.scandir(prebuilt_dir):
             if entry.is_file() and entry.name.endswith('.py') and not entry.name.startswith('__'):
                 try:
-                    spec = importlib.util.spec_from_file_location(entry.name[:-3], entry.path)
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    
-                    for item in dir(module):
-                        obj = getattr(module, item)
-                        if isinstance(obj, type) and issubclass(obj, AbstractBot) and obj != AbstractBot:
-                            bot_instance = obj()
-                            rel_path = os.path.relpath(entry.path, bots_dir)
-                            bots['prebuilt'][rel_path] = bot_instance
-                            break
+                    bot_instance = load_bot(entry.path)
+                    rel_path = os.path.relpath(entry.path, bots_dir)
+                    bots['prebuilt'][rel_path] = bot_instance
                 except Exception as e:
                     continue
 
@@ -501,17 +554,9 @@ class GameUI:
         for entry in os.scandir(user_created_dir):
             if entry.is_file() and entry.name.endswith('.py') and not entry.name.startswith('__'):
                 try:
-                    spec = importlib.util.spec_from_file_location(entry.name[:-3], entry.path)
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    
-                    for item in dir(module):
-                        obj = getattr(module, item)
-                        if isinstance(obj, type) and issubclass(obj, AbstractBot) and obj != AbstractBot:
-                            bot_instance = obj()
-                            rel_path = os.path.relpath(entry.path, bots_dir)
-                            bots['user_created'][rel_path] = bot_instance
-                            break
+                    bot_instance = load_bot(entry.path)
+                    rel_path = os.path.relpath(entry.path, bots_dir)
+                    bots['user_created'][rel_path] = bot_instance
                 except Exception as e:
                     continue
         
@@ -592,14 +637,7 @@ class GameUI:
             description = ""
             if "(Custom)" in bot_name:
                 try:
-                    spec = importlib.util.spec_from_file_location("custom_bot", filename)
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    for item in dir(module):
-                        obj = getattr(module, item)
-                        if isinstance(obj, type) and issubclass(obj, AbstractBot) and obj != AbstractBot:
-                            description = obj().description
-                            break
+                    description = load_bot(filename).description
                 except:
                     description = "Custom bot"
             elif filename in self.available_bots:
@@ -648,49 +686,6 @@ class GameUI:
         self.log_text.see(tk.END)
         self.log_text.update_idletasks()
 
-    def read_latest_log(self, summary_type="game"):
-        """Read the latest log file of specified type"""
-        logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
-        try:
-            # Get all directories sorted by creation time
-            dirs = [d for d in os.listdir(logs_dir) if os.path.isdir(os.path.join(logs_dir, d))]
-            if not dirs:
-                return "No log directories found"
-                
-            # Find latest directory based on type
-            if summary_type == "tournament":
-                tournament_dirs = [d for d in dirs if "tournament" in d]
-                if not tournament_dirs:
-                    return "No tournament logs found"
-                latest_dir = max(tournament_dirs, key=lambda d: d.split('_')[0])
-                filepath = os.path.join(logs_dir, latest_dir, "tournament_summary.txt")
-            else:
-                # For game or games_summary
-                game_dirs = [d for d in dirs if "games" in d]
-                if not game_dirs:
-                    return "No game logs found"
-                latest_dir = max(game_dirs, key=lambda d: d.split('_')[0])
-                if summary_type == "game":
-                    # Find latest vs file
-                    game_files = [f for f in os.listdir(os.path.join(logs_dir, latest_dir)) 
-                                if f.endswith('.txt') and '_vs_' in f]
-                    if not game_files:
-                        return "No game logs found in directory"
-                    latest_file = max(game_files, key=lambda f: os.path.getmtime(
-                        os.path.join(logs_dir, latest_dir, f)))
-                    filepath = os.path.join(logs_dir, latest_dir, latest_file)
-                else:
-                    filepath = os.path.join(logs_dir, latest_dir, "games_summary.txt")
-                    
-            # Read and return the content
-            if os.path.exists(filepath):
-                with open(filepath, 'r') as f:
-                    return f.read()
-            return f"Log file not found: {filepath}"
-            
-        except Exception as e:
-            return f"Error reading log: {str(e)}"
-
     def start_games(self):
         """Run games based on mode."""
         player1_bot = self.player1_path.get()
@@ -703,54 +698,41 @@ class GameUI:
             tk.messagebox.showerror("Error", "Please select at least one opponent")
             return
 
-        try:
-            simulation = PrisonersDilemmaSimulation(player1_bot)
+        # Match logs are kept in memory and only rendered when shown
+        simulation = PrisonersDilemmaSimulation(player1_bot, log_format='lazy', time_decisions=True)
+        if self.mode == "game":
+            opponents = [opponents[0]]
+
+        def show_results(games_dir):
             if self.mode == "game":
-                simulation.run_games([opponents[0]])
-                self.update_log(self.read_latest_log("game"))
+                self.update_log(simulation.render_match() if simulation.match_records else "Game cancelled.\n")
             else:
-                # For multiple test mode
-                simulation.run_games(opponents)
-                # Force a small delay to ensure file is written
-                self.parent.after(100)  
-                self.update_log(self.read_latest_log("games_summary"))
-                self.center_frame.update_idletasks()  # Force UI update
-                    
-        except Exception as e:
-            tk.messagebox.showerror("Error", f"Simulation failed: {str(e)}")
+                self.show_summary(os.path.join(games_dir, "games_summary.txt"), simulation.cancelled)
+
+        # Games run in a worker thread so the window stays responsive
+        self.run_in_background(
+            lambda progress, cancel: simulation.run_games(opponents, progress=progress, cancel=cancel),
+            show_results,
+            lambda e: tk.messagebox.showerror("Error", f"Simulation failed: {str(e)}"))
 
     def load_bot(self, bot_path):
         """Load a bot from a file path."""
         try:
-            spec = importlib.util.spec_from_file_location("bot_module", bot_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
-            for item in dir(module):
-                obj = getattr(module, item)
-                if isinstance(obj, type) and issubclass(obj, AbstractBot) and obj != AbstractBot:
-                    return obj()
-            raise ValueError("No valid bot class found in file")
+            return load_bot(bot_path)
         except Exception as e:
             raise Exception(f"Failed to load bot: {str(e)}")
 
     def start_tournament(self, selected_bot_paths, visualize=True):
         """Start tournament with selected bots."""
-        tournament = TournamentSimulation()
-        try:
-            tournament_dir = tournament.run_all_against_all(selected_bot_paths, visualize=visualize)
-            
-            # Add a small delay to ensure files are written
-            self.parent.after(100)
-            
-            # Read and display tournament summary
-            self.log_text.delete(1.0, tk.END)
-            summary = self.read_latest_log("tournament")
-            if summary:
-                self.update_log(summary)
-            else:
-                self.log_text.insert(tk.END, "Error: Could not read tournament summary")
-            
-        except Exception as e:
+        tournament = TournamentSimulation(log_format='lazy', time_decisions=True)
+
+        def show_error(e):
             self.log_text.delete(1.0, tk.END)
-            self.log_text.insert(tk.END, f"Error during tournament: {str(e)}\n")
\ No newline at end of file
+            self.log_text.insert(tk.END, f"Error during tournament: {str(e)}\n")
+
+        self.run_in_background(
+            lambda progress, cancel: tournament.run_all_against_all(selected_bot_paths, visualize=visualize,
+                                                                    progress=progress, cancel=cancel),
+            lambda tournament_dir: self.show_summary(os.path.join(tournament_dir, "tournament_summary.txt"),
+                                                     tournament.cancelled),
+            show_error)
\ No newline at end of file
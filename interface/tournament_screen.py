@@ -4,6 +4,7 @@ import os
 from interface.game_ui import GameUI
 from interface.menu_screen import MenuScreen
 from simulation.simulate_tournament import TournamentSimulation
+from simulation.leaderboard import Leaderboard
 from .shared_style import Style
 
 class TournamentScreen:
@@ -117,23 +118,46 @@ class TournamentScreen:
         self.game_ui.log_text.delete(1.0, tk.END)
         self.game_ui.log_text.update_idletasks()
         
-        # Start tournament and display summary in widget
-        tournament = TournamentSimulation()
-        try:
-            # Run tournament with visualization disabled
-            tournament_dir = tournament.run_all_against_all(selected_bot_paths, visualize=False)
-            
-            # Add delay to ensure files are written
-            self.root.after(100)
-            
-            # Read and display tournament summary
-            with open(os.path.join(tournament_dir, "tournament_summary.txt"), 'r') as f:
-                summary = f.read()
-                self.game_ui.update_log(summary)
-                
-        except Exception as e:
+        # The tournament runs in a worker thread; provisional standings are shown while
+        # it runs and its summary when it ends
+        tournament = TournamentSimulation(log_format='lazy', time_decisions=True)
+        leaderboard = Leaderboard(len(selected_bot_paths))
+        redraw_pending = False
+        running = True
+        
+        def show_standings():
+            nonlocal redraw_pending
+            redraw_pending = False
+            # A redraw still pending when the tournament ends must not hide its summary
+            if running and self.game_ui.log_text.winfo_exists():
+                self.game_ui.log_text.delete(1.0, tk.END)
+                self.game_ui.log_text.insert(tk.END, leaderboard.render())
+        
+        def add_match(event):
+            # Matches often finish in bursts; the standings are redrawn once per burst
+            nonlocal redraw_pending
+            leaderboard.add(event)
+            if not redraw_pending:
+                redraw_pending = True
+                self.game_ui.log_text.after_idle(show_standings)
+        
+        def show_results(tournament_dir):
+            nonlocal running
+            running = False
+            self.game_ui.show_summary(os.path.join(tournament_dir, "tournament_summary.txt"), tournament.cancelled)
+        
+        def show_error(e):
+            nonlocal running
+            running = False
             self.game_ui.log_text.delete(1.0, tk.END)
             self.game_ui.log_text.insert(tk.END, f"Error during tournament: {str(e)}\n")
+        
+        self.game_ui.run_in_background(
+            lambda progress, cancel: tournament.run_all_against_all(selected_bot_paths, visualize=False,
+                                                                    progress=progress, cancel=cancel),
+            show_results,
+            show_error,
+            add_match)
 
     def back_to_menu(self):
         for widget in self.root.winfo_children():
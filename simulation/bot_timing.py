@@ -0,0 +1,98 @@
+import csv
+import os
+import time
+
+# Decisions taking at least this long are counted as slow
+SLOW_DECISION_NS = 1_000_000
+
+TIMING_FILENAME = "bot_timing.csv"
+
+
+class DecisionTiming:
+    """Latencies of one bot's decisions, merged over matches and worker processes.
+
+    Latencies are counted in a histogram keyed by the latency rounded down to five
+    significant bits, so percentiles are accurate to about 6% without keeping every
+    sample.
+    """
+    def __init__(self):
+        self.total_ns = 0
+        self.slow = 0
+        self.buckets = {}  # Rounded latency in ns -> number of decisions
+
+    @property
+    def decisions(self):
+        return sum(self.buckets.values())
+
+    def timed(self, decide):
+        """Wrap a decide callable so every call is timed."""
+        clock = time.perf_counter_ns
+        buckets = self.buckets
+
+        def timed_decide():
+            start = clock()
+            move = decide()
+            elapsed = clock() - start
+            self.total_ns += elapsed
+            if elapsed >= SLOW_DECISION_NS:
+                self.slow += 1
+            shift = max(elapsed.bit_length() - 5, 0)
+            bucket = elapsed >> shift << shift
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+            return move
+        return timed_decide
+
+    def merge(self, other):
+        self.total_ns += other.total_ns
+        self.slow += other.slow
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def percentile(self, fraction):
+        """Return the latency in ns that the given fraction of decisions do not exceed."""
+        needed = fraction * self.decisions
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= needed:
+                return bucket
+        return 0
+
+
+def merge_timings(timings, merged=None):
+    """Add {bot name: DecisionTiming} to merged (a new dict by default) and return it."""
+    if merged is None:
+        merged = {}
+    for name, timing in timings.items():
+        merged.setdefault(name, DecisionTiming()).merge(timing)
+    return merged
+
+
+def _rows(timings):
+    # Slowest bots first; bots that only replayed move schedules never decided and are left out
+    for name, timing in sorted(timings.items(), key=lambda item: item[1].total_ns, reverse=True):
+        decisions = timing.decisions
+        if decisions:
+            yield (name, decisions, timing.total_ns / 1e6, timing.total_ns / decisions / 1e3,
+                   timing.percentile(0.99) / 1e3, timing.slow)
+
+
+def write_timing_csv(directory, timings):
+    """Write the decision latencies of every bot to bot_timing.csv."""
+    with open(os.path.join(directory, TIMING_FILENAME), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Bot', 'Decisions', 'Total ms', 'Mean us', 'P99 us', 'Slow decisions'])
+        for name, decisions, total_ms, mean_us, p99_us, slow in _rows(timings):
+            writer.writerow([name, decisions, f"{total_ms:.3f}", f"{mean_us:.2f}", f"{p99_us:.2f}", slow])
+
+
+def timing_summary(timings):
+    """Format the decision latencies as a section of a summary file."""
+    name_width = max([len("Bot")] + [len(name) for name in timings])
+    lines = ["DECISION LATENCY",
+             "-" * 50,
+             f"{'Bot'.ljust(name_width)}  {'Decisions':>9}  {'Total ms':>10}  {'Mean us':>9}  {'P99 us':>9}  "
+             f"Slow (>= {SLOW_DECISION_NS / 1e6:g} ms)"]
+    for name, decisions, total_ms, mean_us, p99_us, slow in _rows(timings):
+        lines.append(f"{name.ljust(name_width)}  {decisions:>9}  {total_ms:>10.1f}  {mean_us:>9.2f}  {p99_us:>9.2f}  {slow}")
+    return "\n".join(lines) + "\n"
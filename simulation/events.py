@@ -0,0 +1,97 @@
+import asyncio
+import queue
+import threading
+from collections import namedtuple
+
+# Result of one finished match and how far the run has come; rounds is the match length
+MatchEvent = namedtuple('MatchEvent', ['done', 'total', 'bot1', 'bot2', 'rounds', 'score1', 'score2',
+                                       'mutual_cooperation', 'mutual_defection', 'betrayals1', 'betrayals2'])
+
+
+def match_event(done, total, bot1_name, bot2_name, match_stats):
+    """Build a MatchEvent from the statistics of a tournament match."""
+    mutual_cooperation = match_stats['mutual_cooperation']
+    mutual_defection = match_stats['mutual_defection']
+    betrayals1 = match_stats['betrayals'][bot1_name]
+    betrayals2 = match_stats['betrayals'][bot2_name]
+    return MatchEvent(done, total, bot1_name, bot2_name,
+                      mutual_cooperation + mutual_defection + betrayals1 + betrayals2,
+                      match_stats['scores'][bot1_name], match_stats['scores'][bot2_name],
+                      mutual_cooperation, mutual_defection, betrayals1, betrayals2)
+
+
+# Put on the event queue when the tournament has ended
+_FINISHED = object()
+
+
+class TournamentStream:
+    """Play a tournament in a background thread and yield a MatchEvent as each match finishes.
+
+    Iterate it with a for loop or, inside a coroutine, with async for. Keyword arguments
+    are passed on to TournamentSimulation.run_all_against_all. When the iteration ends,
+    directory holds the tournament directory. Leaving a for loop early cancels the
+    tournament after the matches already running; an async for loop does not close
+    its iterator when left, so call cancel() first.
+    """
+    def __init__(self, simulation, bot_paths, **kwargs):
+        self.simulation = simulation
+        self.bot_paths = list(bot_paths)
+        self.kwargs = kwargs
+        self.directory = None
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def cancel(self):
+        """Stop starting new matches."""
+        self._cancel.set()
+
+    def _start(self, put):
+        if self._thread is not None:
+            raise RuntimeError("A TournamentStream can only be iterated once")
+
+        def run():
+            try:
+                self.directory = self.simulation.run_all_against_all(self.bot_paths, progress=put,
+                                                                     cancel=self._cancel, **self.kwargs)
+            except BaseException as e:
+                # Also SystemExit or KeyboardInterrupt raised by a bot, so the consumer never waits forever
+                put(e)
+            else:
+                put(_FINISHED)
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def __iter__(self):
+        events = queue.Queue()
+        self._start(events.put)
+        try:
+            while True:
+                event = events.get()
+                if event is _FINISHED:
+                    return
+                if isinstance(event, BaseException):
+                    raise event
+                yield event
+        finally:
+            self.cancel()
+            self._thread.join()
+
+    async def _async_events(self):
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+        self._start(lambda event: loop.call_soon_threadsafe(events.put_nowait, event))
+        try:
+            while True:
+                event = await events.get()
+                if event is _FINISHED:
+                    return
+                if isinstance(event, BaseException):
+                    raise event
+                yield event
+        finally:
+            self.cancel()
+            await loop.run_in_executor(None, self._thread.join)
+
+    def __aiter__(self):
+        return self._async_events()
@@ -0,0 +1,155 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from utils.moves import Move
+from utils.move_history import MatchHistory
+from utils.event_bot import bind_bot
+from utils.seeding import isolated_random
+from simulation.match_cache import match_key
+from simulation.match_record import MatchRecord
+from simulation.simulate_tournament import TournamentSimulation, new_run_dir, _init_worker, _play_match_record
+
+
+def _probe_moves(bot_class, opponent_moves, total_rounds, seed):
+    # Play a bot against a fixed sequence of opponent moves for total_rounds rounds
+    with isolated_random(seed):
+        bot = bot_class()
+        bot.total_rounds = total_rounds
+        history = MatchHistory()
+        decide, observe = bind_bot(bot, history, 0)
+        moves = []
+        for opponent_move in opponent_moves[:total_rounds]:
+            move = decide()
+            history.append(move, opponent_move)
+            observe(move, opponent_move)
+            moves.append(move)
+    return moves
+
+
+def uses_total_rounds(bot_class, horizons, seed=0):
+    """Check whether a bot's moves depend on the total_rounds it is told.
+
+    The bot plays a few scripted opponents once with the longest horizon as total_rounds
+    and once for every other horizon, and the shorter matches must be exact prefixes
+    of the longest one. Random draws are seeded identically in every probe match.
+    """
+    longest = max(horizons)
+    rng = random.Random(seed)
+    scripted_opponents = [
+        [Move.COOPERATE] * longest,
+        [Move.DEFECT] * longest,
+        [rng.choice((Move.COOPERATE, Move.DEFECT)) for _ in range(longest)]
+    ]
+    for opponent_moves in scripted_opponents:
+        full_match = _probe_moves(bot_class, opponent_moves, longest, seed)
+        for horizon in horizons:
+            if _probe_moves(bot_class, opponent_moves, horizon, seed) != full_match[:horizon]:
+                return True
+    return False
+
+
+def prefix_outcome_counts(moves1, moves2, horizons):
+    """Return {horizon: (mutual cooperation, mutual defection, betrayals by bot 1,
+    betrayals by bot 2)} over the first horizon rounds of a match."""
+    wanted = set(horizons)
+    mutual_cooperation = mutual_defection = betrayals1 = betrayals2 = 0
+    counts = {}
+    for round_num, (move1, move2) in enumerate(zip(moves1, moves2), 1):
+        if move1 == Move.COOPERATE and move2 == Move.COOPERATE:
+            mutual_cooperation += 1
+        elif move1 == Move.COOPERATE and move2 == Move.DEFECT:
+            betrayals2 += 1
+        elif move1 == Move.DEFECT and move2 == Move.COOPERATE:
+            betrayals1 += 1
+        else:
+            mutual_defection += 1
+        if round_num in wanted:
+            counts[round_num] = (mutual_cooperation, mutual_defection, betrayals1, betrayals2)
+    return counts
+
+
+class MultiHorizonTournament:
+    """Evaluate one round-robin tournament at several match lengths.
+
+    A bot whose moves do not depend on total_rounds plays the first H rounds of any
+    longer match exactly like an H round match, so a pairing of two such bots is played
+    once at the longest horizon and scored on every prefix. Pairings with a bot that
+    reads total_rounds are played again for every horizon, with that horizon as
+    total_rounds.
+    """
+    def __init__(self, bot_paths, horizons, seed=0, workers=1):
+        self.bot_paths = list(bot_paths)
+        self.horizons = sorted(set(horizons))
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.simulation = TournamentSimulation(log_format='lazy')
+        self.horizon_dependent = []  # Names of the bots that read total_rounds
+        self.matches_played = 0
+
+    def run(self):
+        """Play the tournament and return the directory with the results of every horizon."""
+        longest = self.horizons[-1]
+        bots = [self.simulation.load_bot(bot_path) for bot_path in self.bot_paths]
+        dependent = [uses_total_rounds(type(bot), self.horizons, self.seed) for bot in bots]
+        self.horizon_dependent = [bot.name for bot, reads in zip(bots, dependent) if reads]
+
+        # One job per pairing, or one per pairing and horizon if either bot reads total_rounds
+        jobs = []
+        for i in range(len(bots)):
+            for j in range(i + 1, len(bots)):
+                horizons = self.horizons if dependent[i] or dependent[j] else [longest]
+                for horizon in horizons:
+                    seed = match_key(self.bot_paths[i], self.bot_paths[j], horizon, self.seed)
+                    # The bots are told the horizon as total_rounds
+                    jobs.append((i, j, horizon, (self.bot_paths[i], self.bot_paths[j], horizon, horizon, seed)))
+
+        if self.workers > 1 and len(jobs) > 1:
+            chunksize = max(1, len(jobs) // (self.workers * 4))
+            # Matches are only scored, so they are played without logs or timing
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=('lazy', None, False)) as executor:
+                records = list(executor.map(_play_match_record, [job for _, _, _, job in jobs], chunksize=chunksize))
+        else:
+            _init_worker('lazy', None, False)
+            records = [_play_match_record(job) for _, _, _, job in jobs]
+        self.matches_played = len(jobs)
+
+        # Score every horizon from the match played for it, or from the prefix of the longest match
+        results = {horizon: {} for horizon in self.horizons}
+        for (i, j, played_horizon, _), record in zip(jobs, records):
+            moves1, moves2 = MatchRecord(record).moves()
+            horizons = [played_horizon] if dependent[i] or dependent[j] else self.horizons
+            for horizon, counts in prefix_outcome_counts(moves1, moves2, horizons).items():
+                results[horizon][(i, j)] = self.simulation._count_stats(bots[i].name, bots[j].name, counts)
+
+        directory = new_run_dir(self.simulation.logs_dir, "horizons")
+        rankings = {}
+        for horizon in self.horizons:
+            horizon_dir = os.path.join(directory, f"{horizon}_rounds")
+            os.makedirs(horizon_dir, exist_ok=True)
+            pairs = sorted(results[horizon])
+            pairings = [(bots[i], bots[j], self.bot_paths[i], self.bot_paths[j], horizon) for i, j in pairs]
+            rankings[horizon] = self.simulation._write_results(
+                horizon_dir, pairings, [results[horizon][pair] for pair in pairs], horizon)
+
+        self._write_horizons_summary(directory, rankings, len(bots))
+        return directory
+
+    def _write_horizons_summary(self, directory, rankings, num_bots):
+        separate_matches = len(self.horizons) * num_bots * (num_bots - 1) // 2
+        column_width = max(12, max(len(name) for ranking in rankings.values() for name in ranking))
+
+        with open(os.path.join(directory, "horizons_summary.txt"), 'w') as f:
+            f.write("="*50 + "\n")
+            f.write("MULTI-HORIZON SUMMARY\n")
+            f.write("="*50 + "\n\n")
+            f.write(f"Horizons: {', '.join(str(horizon) for horizon in self.horizons)}\n")
+            f.write(f"Matches Played: {self.matches_played} (separate tournaments: {separate_matches})\n")
+            f.write(f"Replayed per horizon (read total_rounds): {', '.join(self.horizon_dependent) or 'none'}\n\n")
+
+            f.write("RANKINGS\n")
+            f.write("-"*50 + "\n")
+            f.write(f"{'Rank':<5}| " + " | ".join(f"{f'{horizon} rounds':<{column_width}}" for horizon in self.horizons) + "\n")
+            for rank in range(num_bots):
+                f.write(f"{rank + 1:<5}| " + " | ".join(f"{rankings[horizon][rank]:<{column_width}}"
+                                                        for horizon in self.horizons) + "\n")
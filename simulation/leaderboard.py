@@ -0,0 +1,82 @@
+import math
+
+
+class Leaderboard:
+    """Provisional standings of a round-robin tournament, updated as matches finish.
+
+    add() takes a MatchEvent (see events.py) and costs O(1). A bot's final average score
+    per match is estimated from the opponents it has met so far, with a 95% margin that
+    shrinks to zero once it has met all num_bots - 1 of them. The possible final ranks
+    of a bot follow from the bots whose intervals overlap its own.
+    """
+    Z = 1.96  # Normal quantile of the 95% margin
+
+    def __init__(self, num_bots):
+        self.opponents = num_bots - 1
+        self.done = 0
+        self.total = 0
+        self._bots = {}  # Bot name -> [matches, mean score, sum of squared deviations]
+        self._all = [0, 0.0, 0.0]  # The same over every score, used while a bot has one match
+
+    def add(self, event):
+        self.done = event.done
+        self.total = event.total
+        for name, score in ((event.bot1, event.score1), (event.bot2, event.score2)):
+            _update(self._bots.setdefault(name, [0, 0.0, 0.0]), score)
+            _update(self._all, score)
+
+    def margin(self, name):
+        """Half-width of the 95% interval of a bot's final average score."""
+        count, _, squares = self._bots[name]
+        left = self.opponents - count
+        if left <= 0:
+            return 0.0
+        if count > 1:
+            variance = squares / (count - 1)
+        elif self._all[0] > 1:
+            variance = self._all[2] / (self._all[0] - 1)
+        else:
+            return math.inf
+        # The final average is over a finite set of opponents, most of them already met
+        return self.Z * math.sqrt(variance / count * left / (self.opponents - 1))
+
+    def standings(self):
+        """Return (name, matches, average, margin, best rank, worst rank) rows, best average first."""
+        intervals = {name: (mean - self.margin(name), mean + self.margin(name))
+                     for name, (_, mean, _) in self._bots.items()}
+        rows = []
+        for name, (count, mean, _) in self._bots.items():
+            low, high = intervals[name]
+            best = 1 + sum(1 for other, (other_low, _) in intervals.items() if other != name and other_low > high)
+            # Bots without a finished match yet could still end up anywhere
+            worst = self.opponents + 1 - sum(1 for other, (_, other_high) in intervals.items()
+                                             if other != name and other_high < low)
+            rows.append((name, count, mean, high - mean, best, worst))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows
+
+    def render(self):
+        """Format the standings as text for the tournament log."""
+        rows = self.standings()
+        name_width = max([len("Bot")] + [len(row[0]) for row in rows])
+        lines = ["=" * 50,
+                 "PROVISIONAL STANDINGS",
+                 "=" * 50,
+                 f"Matches finished: {self.done}/{self.total}",
+                 "",
+                 f"{'#':>3}  {'Bot'.ljust(name_width)}  {'Avg score':>18}  {'Played':>7}  Final rank",
+                 "-" * (name_width + 47)]
+        for position, (name, count, mean, margin, best, worst) in enumerate(rows, 1):
+            average = f"{mean:.1f} +- {margin:.1f}" if math.isfinite(margin) else f"{mean:.1f} +- ?"
+            final_rank = str(best) if best == worst else f"{best}-{worst}"
+            lines.append(f"{position:>3}  {name.ljust(name_width)}  {average:>18}  "
+                         f"{f'{count}/{self.opponents}':>7}  {final_rank}")
+        return "\n".join(lines) + "\n"
+
+
+def _update(running, value):
+    """Add a value to [count, mean, sum of squared deviations] (Welford's method)."""
+    running[0] += 1
+    delta = value - running[1]
+    running[1] += delta / running[0]
+    running[2] += delta * (value - running[1])
@@ -0,0 +1,105 @@
+from utils.game_config import GameConfig, payoffs
+
+# NumPy is optional; without it the state distribution is advanced one round at a time
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _outcome_probabilities(cooperate1, cooperate2):
+    # Probabilities of the outcomes CC, CD, DC, DD (bot 1's move first) of one round
+    return [cooperate1 * cooperate2, cooperate1 * (1 - cooperate2),
+            (1 - cooperate1) * cooperate2, (1 - cooperate1) * (1 - cooperate2)]
+
+
+def memory_one_outcome_counts(vector1, vector2, rounds):
+    """Return the expected (mutual cooperation, mutual defection, betrayals by bot 1,
+    betrayals by bot 2) of a match between two MemoryOne strategies.
+
+    The outcome of each round is a 4-state Markov chain. With NumPy the expected number
+    of visits to each state over the match is read from a single matrix power of
+    [[M, I], [0, I]], whose top-right block is I + M + ... + M^(rounds - 1).
+    """
+    # Bot 2 sees every outcome from its own side, so CD for bot 1 is DC for bot 2
+    cooperate1 = [vector1.cc, vector1.cd, vector1.dc, vector1.dd]
+    cooperate2 = [vector2.cc, vector2.dc, vector2.cd, vector2.dd]
+    initial = _outcome_probabilities(vector1.first, vector2.first)
+    transitions = [_outcome_probabilities(p, q) for p, q in zip(cooperate1, cooperate2)]
+
+    if np is not None:
+        augmented = np.zeros((8, 8))
+        augmented[:4, :4] = transitions
+        augmented[:4, 4:] = np.eye(4)
+        augmented[4:, 4:] = np.eye(4)
+        visits = (np.array(initial) @ np.linalg.matrix_power(augmented, rounds)[:4, 4:]).tolist()
+    else:
+        visits = [0.0] * 4
+        distribution = initial
+        for _ in range(rounds):
+            visits = [total + probability for total, probability in zip(visits, distribution)]
+            distribution = [sum(distribution[state] * transitions[state][outcome] for state in range(4))
+                            for outcome in range(4)]
+
+    mutual_cooperation, betrayals2, betrayals1, mutual_defection = visits
+    return mutual_cooperation, mutual_defection, betrayals1, betrayals2
+
+
+def memory_one_scores(vector1, vector2, rounds, config=GameConfig):
+    """Return the expected (bot 1, bot 2) scores of a match between two MemoryOne strategies."""
+    mutual_cooperation, mutual_defection, betrayals1, betrayals2 = memory_one_outcome_counts(vector1, vector2, rounds)
+    cooperation_points, betrayal_points, betrayed_points, defection_points = payoffs(config)
+    score1 = (mutual_cooperation * cooperation_points + mutual_defection * defection_points
+              + betrayals1 * betrayal_points + betrayals2 * betrayed_points)
+    score2 = (mutual_cooperation * cooperation_points + mutual_defection * defection_points
+              + betrayals2 * betrayal_points + betrayals1 * betrayed_points)
+    return score1, score2
+
+
+def _score_moments(initial, transitions, rewards, rounds):
+    # Mean and second moment of the total reward over the match. Alongside the state
+    # distribution p, m[s] and q[s] hold the expected total and squared total restricted
+    # to being in state s; entering state s adds r = rewards[s], so m' = mM + pMr and
+    # q' = qM + 2mMr + pMr^2.
+    if rounds == 0:
+        return 0.0, 0.0
+    distribution = list(initial)
+    first = [probability * reward for probability, reward in zip(initial, rewards)]
+    second = [probability * reward * reward for probability, reward in zip(initial, rewards)]
+
+    if np is not None:
+        step = np.array(transitions)
+        blocks = [[step, step * rewards, step * np.square(rewards)],
+                  [np.zeros((4, 4)), step, 2 * step * rewards],
+                  [np.zeros((4, 4)), np.zeros((4, 4)), step]]
+        moments = np.array(distribution + first + second) @ np.linalg.matrix_power(np.block(blocks), rounds - 1)
+        return float(moments[4:8].sum()), float(moments[8:].sum())
+
+    for _ in range(rounds - 1):
+        distribution, first, second = (
+            [sum(distribution[state] * transitions[state][outcome] for state in range(4)) for outcome in range(4)],
+            [sum(first[state] * transitions[state][outcome] for state in range(4)) for outcome in range(4)],
+            [sum(second[state] * transitions[state][outcome] for state in range(4)) for outcome in range(4)])
+        second = [q + 2 * m * reward + p * reward * reward
+                  for p, m, q, reward in zip(distribution, first, second, rewards)]
+        first = [m + p * reward for p, m, reward in zip(distribution, first, rewards)]
+    return sum(first), sum(second)
+
+
+def memory_one_score_variances(vector1, vector2, rounds, config=GameConfig):
+    """Return the variances of the (bot 1, bot 2) scores of a match between two MemoryOne
+    strategies, computed exactly from the same Markov chain as memory_one_scores."""
+    cooperate1 = [vector1.cc, vector1.cd, vector1.dc, vector1.dd]
+    cooperate2 = [vector2.cc, vector2.dc, vector2.cd, vector2.dd]
+    initial = _outcome_probabilities(vector1.first, vector2.first)
+    transitions = [_outcome_probabilities(p, q) for p, q in zip(cooperate1, cooperate2)]
+
+    cooperation_points, betrayal_points, betrayed_points, defection_points = payoffs(config)
+    variances = []
+    # Points of the outcomes CC, CD, DC, DD for bot 1 and for bot 2
+    for rewards in ([cooperation_points, betrayed_points, betrayal_points, defection_points],
+                    [cooperation_points, betrayal_points, betrayed_points, defection_points]):
+        mean, second = _score_moments(initial, transitions, rewards, rounds)
+        # Rounding can leave a tiny negative value where the score is certain
+        variances.append(max(float(second - mean * mean), 0.0))
+    return tuple(variances)
@@ -0,0 +1,124 @@
+import base64
+import hashlib
+import json
+import os
+from utils.game_config import GameConfig, payoffs
+
+# Bump when an engine change can change match results, so old entries are not reused
+CACHE_VERSION = 1
+
+# Digests of bot files computed so far, keyed by absolute path.
+# Each entry stores the file's (mtime, size) so edited files are hashed again.
+_file_digests = {}
+
+
+def file_digest(path):
+    """Return the SHA-256 digest of a file's contents."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    file_key = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _file_digests.get(path)
+    if cached is not None and cached[0] == file_key:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    _file_digests[path] = (file_key, digest)
+    return digest
+
+
+def match_key(bot1_path, bot2_path, rounds, seed, config=GameConfig):
+    """Return the cache key of a match between two bot files played with config."""
+    # Bots see NUMBER_OF_ROUNDS as total_rounds even when a match is longer or shorter
+    parts = [CACHE_VERSION, file_digest(bot1_path), file_digest(bot2_path),
+             payoffs(config), config.NUMBER_OF_ROUNDS, rounds, seed]
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+
+def encode_match_entry(match_stats, record):
+    """Convert match statistics and a packed match record into a JSON-friendly dict."""
+    # Counts from the vectorized engine may be NumPy integers, which json cannot write;
+    # scores are only fractional if the payoffs are
+    stats = {
+        'scores': {name: int(score) if float(score).is_integer() else float(score)
+                   for name, score in match_stats['scores'].items()},
+        'mutual_cooperation': int(match_stats['mutual_cooperation']),
+        'mutual_defection': int(match_stats['mutual_defection']),
+        'betrayals': {name: int(count) for name, count in match_stats['betrayals'].items()}
+    }
+    return {'stats': stats, 'record': base64.b64encode(record).decode('ascii')}
+
+
+def decode_match_entry(entry):
+    """Inverse of encode_match_entry, returns (match_stats, record)."""
+    return entry['stats'], base64.b64decode(entry['record'])
+
+
+class MatchCache:
+    """Persistent cache of match results, one JSON file per match.
+
+    Entries are keyed by match_key and hold the match statistics together with the packed
+    match record, so the match log can be written again without replaying it.
+    Once the cache holds more than max_entries matches, the least recently used
+    ones are evicted.
+    """
+    def __init__(self, directory=None, max_entries=50000):
+        if directory is None:
+            directory = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache', 'matches')
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Return (match_stats, record) for a cached match, or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        os.utime(path)
+        self.hits += 1
+        return decode_match_entry(entry)
+
+    def put(self, key, match_stats, record):
+        """Store the statistics and packed match record of a played match."""
+        entry = encode_match_entry(match_stats, record)
+
+        # Write to a temporary file first so a reader never sees a partial entry
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(temp_path, path)
+
+    def evict(self):
+        """Delete the least recently used entries above max_entries and return how many were deleted."""
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.json')]
+        if len(entries) <= self.max_entries:
+            return 0
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+        evicted = 0
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+                evicted += 1
+            except OSError:
+                pass
+        return evicted
+
+    def clear(self):
+        """Delete every cached match."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                os.remove(entry.path)
@@ -0,0 +1,80 @@
+from datetime import datetime
+from utils.moves import Move
+from utils.game_config import GameConfig
+
+
+def render_match_log(bot1_name, bot2_name, moves1, moves2, payoffs=None, timestamp=None, betrayal_labels=None):
+    """Render the human-readable log of a played match from its move sequences.
+
+    payoffs is a (mutual cooperation, betrayal, betrayed, mutual defection) tuple and
+    defaults to the values in GameConfig. betrayal_labels overrides the labels of the
+    two betrayal statistics lines.
+    """
+    if payoffs is None:
+        payoffs = (GameConfig.MUTUAL_COOPERATION_POINTS, GameConfig.BETRAYAL_POINTS,
+                   GameConfig.BETRAYED_POINTS, GameConfig.MUTUAL_DEFECTION_POINTS)
+    cooperation_points, betrayal_points, betrayed_points, defection_points = payoffs
+    if timestamp is None:
+        timestamp = datetime.now()
+    if betrayal_labels is None:
+        betrayal_labels = (f"Betrayals by {bot1_name}", f"Betrayals by {bot2_name}")
+
+    output_lines = [
+        "="*50,
+        f"MATCH RESULTS - {timestamp.strftime('%Y-%m-%d %H:%M')}",
+        f"Bot 1: {bot1_name}",
+        f"Bot 2: {bot2_name}",
+        "="*50,
+        "",
+        "ROUND HISTORY:",
+        f"{'Round':^6} | {'Bot 1':^10} | {'Bot 2':^10} | {'Round Result':^12} | {'Current Score':^12}",
+        "-"*60
+    ]
+
+    # Points and the formatted moves and result of each round outcome, indexed by
+    # (bot 1 defected) + 2 * (bot 2 defected)
+    outcomes = []
+    for points1, points2, move1, move2 in ((cooperation_points, cooperation_points, Move.COOPERATE, Move.COOPERATE),
+                                           (betrayal_points, betrayed_points, Move.DEFECT, Move.COOPERATE),
+                                           (betrayed_points, betrayal_points, Move.COOPERATE, Move.DEFECT),
+                                           (defection_points, defection_points, Move.DEFECT, Move.DEFECT)):
+        round_result = f"{points1:^2} - {points2:^2}"
+        outcomes.append((points1, points2, f"{move1.name:^10} | {move2.name:^10} | {round_result:^12}"))
+
+    score1 = score2 = 0
+    counts = [0, 0, 0, 0]  # Mutual cooperation, betrayals by bot 1, by bot 2, mutual defection
+    for round_num, (move1, move2) in enumerate(zip(moves1, moves2), 1):
+        outcome = (move1 is Move.DEFECT) + 2 * (move2 is Move.DEFECT)
+        points1, points2, moves = outcomes[outcome]
+        counts[outcome] += 1
+        score1 += points1
+        score2 += points2
+
+        current_score = f"{score1:^5} - {score2:^5}"
+        output_lines.append(f"{round_num:^6} | {moves} | {current_score}")
+    mutual_cooperation, betrayals1, betrayals2, mutual_defection = counts
+
+    rounds = len(moves1)
+    output_lines.extend([
+        "\nMATCH STATISTICS:",
+        "-"*50,
+        f"Total Rounds: {rounds}",
+        f"Mutual Cooperation: {mutual_cooperation} ({mutual_cooperation/rounds*100:.1f}%)",
+        f"Mutual Defection: {mutual_defection} ({mutual_defection/rounds*100:.1f}%)",
+        f"{betrayal_labels[0]}: {betrayals1} ({betrayals1/rounds*100:.1f}%)",
+        f"{betrayal_labels[1]}: {betrayals2} ({betrayals2/rounds*100:.1f}%)",
+        "",
+        "FINAL SCORES:",
+        "-"*50,
+        f"{bot1_name}: {score1}",
+        f"{bot2_name}: {score2}",
+        "="*50
+    ])
+    return '\n'.join(output_lines)
+
+
+def render_match_record(record, betrayal_labels=None):
+    """Render the human-readable log of a binary match record."""
+    moves1, moves2 = record.moves()
+    return render_match_log(record.bot1, record.bot2, moves1, moves2,
+                            record.payoffs, record.timestamp, betrayal_labels)
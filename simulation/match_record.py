@@ -0,0 +1,284 @@
+import mmap
+import os
+import struct
+from datetime import datetime
+from utils.moves import Move
+from utils.move_history import HistoryView
+from utils.game_config import GameConfig
+
+# Binary match record layout (little endian):
+#   header  - magic, version, name lengths, rounds, timestamp and the four payoffs
+#   names   - UTF-8 encoded names of bot 1 and bot 2
+#   moves   - one bit per round for bot 1, then one bit per round for bot 2
+#             (bit i of the stream is round i + 1, a set bit means DEFECT)
+# Records are self-delimiting, so several of them can be stored in one file.
+RECORD_MAGIC = b'PDMR'
+RECORD_VERSION = 2
+RECORD_EXTENSION = '.pdr'
+_HEADER = struct.Struct('<4sBxHHIq4d')
+# Version 1 records stored the payoffs as 16-bit integers, which swept configs can exceed
+_HEADERS = {1: struct.Struct('<4sBxHHIq4h'), 2: _HEADER}
+_MAGIC_AND_VERSION = struct.Struct('<4sB')
+
+# Turns the 0 and 1 bytes of HistoryView.bits() into binary digits
+_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+# Number of packed bytes processed at once when aggregating over a record
+_CHUNK_SIZE = 4096
+
+
+def _popcount(value):
+    return bin(value).count('1')
+
+
+def _number(value):
+    # Whole payoffs read back as ints, so scores and logs look the same as before
+    return int(value) if float(value).is_integer() else value
+
+
+def pack_moves(moves):
+    """Pack a sequence of moves into bytes, one bit per round."""
+    if not moves:
+        return b''
+    bits = moves.bits() if isinstance(moves, HistoryView) else bytes(move == Move.DEFECT for move in moves)
+    # Round i is bit i of a little-endian integer, whose binary digits are the bits reversed
+    return int(bits[::-1].translate(_DIGITS), 2).to_bytes((len(bits) + 7) // 8, 'little')
+
+
+def unpack_moves(packed, rounds):
+    """Inverse of pack_moves."""
+    return [Move.DEFECT if packed[i >> 3] >> (i & 7) & 1 else Move.COOPERATE for i in range(rounds)]
+
+
+def encode_match_record(bot1_name, bot2_name, moves1, moves2, payoffs=None, timestamp=None):
+    """Encode one match as a binary record.
+
+    payoffs is a (mutual cooperation, betrayal, betrayed, mutual defection) tuple and
+    defaults to the values in GameConfig.
+    """
+    if len(moves1) != len(moves2):
+        raise ValueError("Both bots must have played the same number of rounds")
+    if payoffs is None:
+        payoffs = (GameConfig.MUTUAL_COOPERATION_POINTS, GameConfig.BETRAYAL_POINTS,
+                   GameConfig.BETRAYED_POINTS, GameConfig.MUTUAL_DEFECTION_POINTS)
+    if timestamp is None:
+        timestamp = datetime.now()
+
+    name1 = bot1_name.encode('utf-8')
+    name2 = bot2_name.encode('utf-8')
+    header = _HEADER.pack(RECORD_MAGIC, RECORD_VERSION, len(name1), len(name2), len(moves1),
+                          int(timestamp.timestamp()), *payoffs)
+    return b''.join([header, name1, name2, pack_moves(moves1), pack_moves(moves2)])
+
+
+def write_match_record(path, bot1_name, bot2_name, moves1, moves2, payoffs=None, timestamp=None):
+    """Write one match as a binary record file."""
+    with open(path, 'wb') as f:
+        f.write(encode_match_record(bot1_name, bot2_name, moves1, moves2, payoffs, timestamp))
+
+
+class MatchRecord:
+    """A single match record inside a memory-mapped buffer.
+
+    Only the header is decoded up front; moves are read from the buffer on demand.
+    """
+    def __init__(self, buffer, offset=0):
+        magic, version = _MAGIC_AND_VERSION.unpack_from(buffer, offset)
+        if magic != RECORD_MAGIC:
+            raise ValueError(f"Not a match record at offset {offset}")
+        if version not in _HEADERS:
+            raise ValueError(f"Unsupported match record version {version}")
+        header = _HEADERS[version]
+        _, _, len1, len2, rounds, timestamp, *payoffs = header.unpack_from(buffer, offset)
+
+        names_offset = offset + header.size
+        self.bot1 = bytes(buffer[names_offset:names_offset + len1]).decode('utf-8')
+        self.bot2 = bytes(buffer[names_offset + len1:names_offset + len1 + len2]).decode('utf-8')
+        self.rounds = rounds
+        self.timestamp = datetime.fromtimestamp(timestamp)
+        self.payoffs = tuple(_number(points) for points in payoffs)
+
+        self._buffer = buffer
+        self._packed_size = (rounds + 7) // 8
+        self._moves1_offset = names_offset + len1 + len2
+        self._moves2_offset = self._moves1_offset + self._packed_size
+        self.offset = offset
+        self.size = self._moves2_offset + self._packed_size - offset
+
+    def move(self, round_num):
+        """Return the (bot 1, bot 2) moves of a round, counting rounds from 1."""
+        if not 1 <= round_num <= self.rounds:
+            raise IndexError(f"Round {round_num} is outside 1..{self.rounds}")
+        i = round_num - 1
+        bit1 = self._buffer[self._moves1_offset + (i >> 3)] >> (i & 7) & 1
+        bit2 = self._buffer[self._moves2_offset + (i >> 3)] >> (i & 7) & 1
+        return (Move.DEFECT if bit1 else Move.COOPERATE,
+                Move.DEFECT if bit2 else Move.COOPERATE)
+
+    def moves(self):
+        """Return the full move lists of both bots."""
+        packed1 = self._buffer[self._moves1_offset:self._moves1_offset + self._packed_size]
+        packed2 = self._buffer[self._moves2_offset:self._moves2_offset + self._packed_size]
+        return unpack_moves(packed1, self.rounds), unpack_moves(packed2, self.rounds)
+
+    def outcome_counts(self):
+        """Count round outcomes without unpacking the moves.
+
+        Returns (mutual cooperation, mutual defection, betrayals by bot 1, betrayals by bot 2).
+        """
+        mutual_cooperation = mutual_defection = betrayals1 = betrayals2 = 0
+        for start in range(0, self._packed_size, _CHUNK_SIZE):
+            end = min(start + _CHUNK_SIZE, self._packed_size)
+            defects1 = int.from_bytes(self._buffer[self._moves1_offset + start:self._moves1_offset + end], 'little')
+            defects2 = int.from_bytes(self._buffer[self._moves2_offset + start:self._moves2_offset + end], 'little')
+            # Padding bits in the last byte are zero and must not count as cooperation
+            mask = (1 << min((end - start) * 8, self.rounds - start * 8)) - 1
+            cooperates1 = ~defects1 & mask
+            cooperates2 = ~defects2 & mask
+
+            mutual_cooperation += _popcount(cooperates1 & cooperates2)
+            mutual_defection += _popcount(defects1 & defects2)
+            betrayals1 += _popcount(defects1 & cooperates2)
+            betrayals2 += _popcount(cooperates1 & defects2)
+        return mutual_cooperation, mutual_defection, betrayals1, betrayals2
+
+    def scores(self):
+        """Return the final (bot 1, bot 2) scores using the payoffs stored in the record."""
+        mutual_cooperation, mutual_defection, betrayals1, betrayals2 = self.outcome_counts()
+        cooperation_points, betrayal_points, betrayed_points, defection_points = self.payoffs
+        score1 = (mutual_cooperation * cooperation_points + mutual_defection * defection_points
+                  + betrayals1 * betrayal_points + betrayals2 * betrayed_points)
+        score2 = (mutual_cooperation * cooperation_points + mutual_defection * defection_points
+                  + betrayals2 * betrayal_points + betrayals1 * betrayed_points)
+        return score1, score2
+
+    def cooperation_rates(self):
+        """Return the fraction of rounds in which each bot cooperated."""
+        if self.rounds == 0:
+            return 0.0, 0.0
+        mutual_cooperation, _, betrayals1, betrayals2 = self.outcome_counts()
+        return ((mutual_cooperation + betrayals2) / self.rounds,
+                (mutual_cooperation + betrayals1) / self.rounds)
+
+    def stats(self):
+        """Return match statistics in the same shape as TournamentSimulation._run_match."""
+        mutual_cooperation, mutual_defection, betrayals1, betrayals2 = self.outcome_counts()
+        score1, score2 = self.scores()
+        return {
+            'scores': {self.bot1: score1, self.bot2: score2},
+            'mutual_cooperation': mutual_cooperation,
+            'mutual_defection': mutual_defection,
+            'betrayals': {self.bot1: betrayals1, self.bot2: betrayals2}
+        }
+
+
+class MatchRecordReader:
+    """Memory-mapped reader for a file holding one or more match records."""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = None
+        self.records = []
+
+        if os.path.getsize(path) == 0:
+            return
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Walk the record headers to index the file
+        offset = 0
+        while offset < len(self._mmap):
+            record = MatchRecord(self._mmap, offset)
+            self.records.append(record)
+            offset += record.size
+
+    def find(self, bot1_name, bot2_name):
+        """Return the record of a match between two bots, in either order."""
+        for record in self.records:
+            if {record.bot1, record.bot2} == {bot1_name, bot2_name}:
+                return record
+        raise KeyError(f"No match between {bot1_name} and {bot2_name} in {self.path}")
+
+    def close(self):
+        self.records = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+
+def parse_text_log(path):
+    """Read bot names, timestamp, payoffs and moves from a text _vs_ match log."""
+    bot1_name = bot2_name = None
+    timestamp = None
+    moves1, moves2 = [], []
+    payoffs = [GameConfig.MUTUAL_COOPERATION_POINTS, GameConfig.BETRAYAL_POINTS,
+               GameConfig.BETRAYED_POINTS, GameConfig.MUTUAL_DEFECTION_POINTS]
+
+    with open(path, 'r') as f:
+        for line in f:
+            if line.startswith("MATCH RESULTS - ") and timestamp is None:
+                timestamp = datetime.strptime(line[len("MATCH RESULTS - "):].strip(), '%Y-%m-%d %H:%M')
+            elif line.startswith("Bot 1: ") and bot1_name is None:
+                bot1_name = line[len("Bot 1: "):].rstrip('\n')
+            elif line.startswith("Bot 2: ") and bot2_name is None:
+                bot2_name = line[len("Bot 2: "):].rstrip('\n')
+            else:
+                columns = [column.strip() for column in line.split('|')]
+                if len(columns) != 5 or not columns[0].isdigit():
+                    continue
+                move1, move2 = Move[columns[1]], Move[columns[2]]
+                moves1.append(move1)
+                moves2.append(move2)
+
+                # Recover the payoffs the match was played with from the round results
+                points1, points2 = (_number(float(points)) for points in columns[3].split(' - '))
+                if move1 == Move.COOPERATE and move2 == Move.COOPERATE:
+                    payoffs[0] = points1
+                elif move1 == Move.COOPERATE and move2 == Move.DEFECT:
+                    payoffs[2], payoffs[1] = points1, points2
+                elif move1 == Move.DEFECT and move2 == Move.COOPERATE:
+                    payoffs[1], payoffs[2] = points1, points2
+                else:
+                    payoffs[3] = points1
+
+    if bot1_name is None or bot2_name is None:
+        raise ValueError(f"{path} is not a match log")
+    return bot1_name, bot2_name, moves1, moves2, tuple(payoffs), timestamp
+
+
+def convert_text_log(path, record_path=None):
+    """Convert a text _vs_ match log into a binary record and return the record path."""
+    if record_path is None:
+        record_path = os.path.splitext(path)[0] + RECORD_EXTENSION
+    bot1_name, bot2_name, moves1, moves2, payoffs, timestamp = parse_text_log(path)
+    write_match_record(record_path, bot1_name, bot2_name, moves1, moves2, payoffs, timestamp)
+    return record_path
+
+
+def convert_log_directory(directory, remove_text=False):
+    """Convert every text _vs_ match log below a directory and return how many were converted."""
+    converted = 0
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            if '_vs_' in filename and filename.endswith('.txt'):
+                path = os.path.join(root, filename)
+                convert_text_log(path)
+                if remove_text:
+                    os.remove(path)
+                converted += 1
+    return converted
@@ -0,0 +1,290 @@
+import os
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from statistics import NormalDist, mean, variance
+from utils.game_config import GameConfig
+from utils.seeding import isolated_random
+from utils.strategy_table import get_memory_one
+from simulation.match_cache import match_key
+from simulation.markov import memory_one_scores, memory_one_score_variances
+from simulation import simulate_tournament
+from simulation.simulate_tournament import TournamentSimulation, new_run_dir
+
+# Mean, standard deviation and confidence interval of the mean of a score
+ScoreSummary = namedtuple('ScoreSummary', ['mean', 'std', 'low', 'high'])
+
+
+def summarize(samples, confidence=0.95, variances=None):
+    """Summarize score samples, using a normal approximation for the confidence interval.
+
+    Samples that are expected scores rather than played ones come with the variances of
+    the scores they stand for. Those are part of the spread of a match score (std), but
+    not of the uncertainty of the mean, which only comes from the spread between samples.
+    """
+    sample_mean = mean(samples)
+    spread = variance(samples) if len(samples) > 1 else 0.0
+    std = sqrt(spread + (mean(variances) if variances else 0.0))
+    half_width = NormalDist().inv_cdf((1 + confidence) / 2) * sqrt(spread / len(samples))
+    return ScoreSummary(sample_mean, std, sample_mean - half_width, sample_mean + half_width)
+
+
+def summarize_average(cells, confidence=0.95):
+    """Summarize a bot's average score per match from the (ScoreSummary, samples) pairs of its cells.
+
+    Matches are independent, so the variance of the average is the sum of the cell
+    variances divided by the number of opponents squared, and the same holds for the
+    squared standard errors of the cell means.
+    """
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    average = mean(summary.mean for summary, _ in cells)
+    std = sqrt(sum(summary.std ** 2 for summary, _ in cells)) / len(cells)
+    standard_error = sqrt(sum(((summary.high - summary.mean) / z) ** 2 for summary, _ in cells)) / len(cells)
+    half_width = z * standard_error
+    return ScoreSummary(average, std, average - half_width, average + half_width)
+
+
+class ReplicateTournament:
+    """Play the same round-robin tournament many times to rank bots that use random.
+
+    Every replicate schedules the tournament again and every match gets its own random
+    stream, derived from the seed, the replicate and both bot files. A pairing that draws
+    nothing from random in its first match is deterministic, so it is played only once
+    for each match length and its score reused in every other replicate. A pairing of
+    two bots with a memory_one() vector is never played: every replicate gets its exact
+    expected score and the exact variance of the score around it (see markov.py). Its
+    Std is that spread of a single match score, while its mean is known, so its
+    interval only widens when noise varies the match lengths.
+    """
+    def __init__(self, bot_paths, rounds=GameConfig.NUMBER_OF_ROUNDS, seed=0, workers=1, confidence=0.95):
+        self.bot_paths = list(bot_paths)
+        self.rounds = rounds
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.confidence = confidence
+        self.simulation = TournamentSimulation(log_format='lazy')
+
+        self.names = {}
+        # (bot1_path, bot2_path) -> list of (score1, score2, variance1, variance2), one per
+        # replicate; the variances are 0 for played matches
+        self.samples = {}
+        self.deterministic = {}  # (bot1_path, bot2_path, match_rounds) -> (score1, score2)
+        # (bot1_path, bot2_path, match_rounds) -> expected scores and their variances, or None if played
+        self.exact = {}
+        self._memory_one = {}  # bot_path -> MemoryOne or None
+        self.matches_played = 0
+        self.fixed_matches = None  # Matches a fixed number of replicates would play, for adaptive runs
+        self._schedules = {}
+
+    @property
+    def replicates(self):
+        return max((len(samples) for samples in self.samples.values()), default=0)
+
+    def _scheduled(self, replicate):
+        """Return {(bot1_path, bot2_path): match_rounds} for every pairing of a replicate."""
+        if replicate not in self._schedules:
+            # The schedule of every replicate has its own random stream
+            rng = random.Random(f"{self.seed}:{replicate}")
+            pairings, _ = self.simulation._schedule_pairings(self.bot_paths, self.rounds, rng)
+            for bot1, bot2, bot1_path, bot2_path, _ in pairings:
+                self.names[bot1_path] = bot1.name
+                self.names[bot2_path] = bot2.name
+                self._memory_one.setdefault(bot1_path, get_memory_one(bot1))
+                self._memory_one.setdefault(bot2_path, get_memory_one(bot2))
+            self._schedules[replicate] = {(bot1_path, bot2_path): match_rounds
+                                          for _, _, bot1_path, bot2_path, match_rounds in pairings}
+        return self._schedules[replicate]
+
+    def _exact_scores(self, pairing):
+        """Return the expected scores and their variances of a pairing between two memory-one bots, or None."""
+        if pairing not in self.exact:
+            vector1, vector2 = self._memory_one[pairing[0]], self._memory_one[pairing[1]]
+            self.exact[pairing] = None
+            if vector1 is not None and vector2 is not None:
+                config = self.simulation.config
+                self.exact[pairing] = (memory_one_scores(vector1, vector2, pairing[2], config)
+                                       + memory_one_score_variances(vector1, vector2, pairing[2], config))
+        return self.exact[pairing]
+
+    def _worker_args(self):
+        # Matches are only scored, so they are played without logs or timing
+        return 'lazy', self.simulation.config, False
+
+    def _play(self, executor, jobs):
+        if executor is None:
+            simulate_tournament._init_worker(*self._worker_args())
+            return [_play_replicate(job) for job in jobs]
+        return list(executor.map(_play_replicate, jobs, chunksize=max(1, len(jobs) // (self.workers * 4))))
+
+    def _play_samples(self, executor, requests):
+        """Play the requested (replicate, (bot1_path, bot2_path)) samples and record their scores."""
+        jobs, pending = [], []
+        for replicate, pair in requests:
+            pairing = pair + (self._scheduled(replicate)[pair],)
+            job = None
+            if pairing not in self.deterministic and self._exact_scores(pairing) is None:
+                job = pairing + (match_key(*pairing, f"{self.seed}:{replicate}"),)
+                jobs.append(job)
+            pending.append((pairing, job))
+
+        played = dict(zip(jobs, self._play(executor, jobs)))
+        self.matches_played += len(jobs)
+        for job, (score1, score2, deterministic) in played.items():
+            if deterministic:
+                self.deterministic[job[:3]] = (score1, score2)
+
+        for pairing, job in pending:
+            if job is not None:
+                scores = played[job][:2] + (0.0, 0.0)
+            elif pairing in self.deterministic:
+                scores = self.deterministic[pairing] + (0.0, 0.0)
+            else:
+                scores = self.exact[pairing]
+            self.samples.setdefault(pairing[:2], []).append(scores)
+
+    def _executor(self):
+        if self.workers > 1:
+            return ProcessPoolExecutor(max_workers=self.workers, initializer=simulate_tournament._init_worker,
+                                       initargs=self._worker_args())
+        return None
+
+    def run(self, replicates):
+        """Play the given number of replicates and return the directory with the results."""
+        executor = self._executor()
+        try:
+            # The first replicate finds the deterministic pairings, the rest are played together
+            self._play_samples(executor, [(0, pair) for pair in self._scheduled(0)])
+            self._play_samples(executor, [(replicate, pair) for replicate in range(1, replicates)
+                                          for pair in self._scheduled(replicate)])
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return self.write_results()
+
+    def run_adaptive(self, max_replicates=200, min_replicates=5, batch_size=5):
+        """Play replicates only of the pairings that can still change the ranking.
+
+        After one replicate of every pairing, each round of scheduling adds batch_size
+        replicates of the pairings that involve a bot not yet separated from a neighbour
+        in the ranking at self.confidence, until all adjacent ranks are separated or those
+        pairings reach max_replicates. Returns the directory with the results.
+        """
+        executor = self._executor()
+        try:
+            self._play_samples(executor, [(0, pair) for pair in self._scheduled(0)])
+            while True:
+                requests = []
+                for pair in self._undecided_pairs(min_replicates):
+                    played = len(self.samples[pair])
+                    requests.extend((replicate, pair) for replicate in range(played, min(played + batch_size, max_replicates)))
+                if not requests:
+                    break
+                self._play_samples(executor, requests)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.fixed_matches = sum(0 if self._is_exact(pair) else 1 if self._is_settled(pair) else max_replicates
+                                 for pair in self.samples)
+        return self.write_results()
+
+    def _is_exact(self, pair):
+        return self._memory_one[pair[0]] is not None and self._memory_one[pair[1]] is not None
+
+    def _is_settled(self, pair):
+        # A deterministic or exactly scored pairing only varies if noise changes the length of its matches
+        pairing = pair + (self.rounds,)
+        return not self.simulation.config.ADD_NOISE and (pairing in self.deterministic
+                                                         or self.exact.get(pairing) is not None)
+
+    def _undecided_pairs(self, min_replicates):
+        """Return the pairings that need more replicates to settle the ranking."""
+        ranking = self.bot_summaries()
+        undecided = set()
+        for (name1, summary1), (name2, summary2) in zip(ranking, ranking[1:]):
+            # Adjacent ranks are separated when the difference of their means exceeds its interval
+            half_width = sqrt((summary1.high - summary1.mean) ** 2 + (summary2.high - summary2.mean) ** 2)
+            if half_width > 0 and summary1.mean - summary2.mean <= half_width:
+                undecided.update([name1, name2])
+
+        return [pair for pair, samples in self.samples.items()
+                if not self._is_settled(pair)
+                and (len(samples) < min_replicates
+                     or self.names[pair[0]] in undecided or self.names[pair[1]] in undecided)]
+
+    def cell_summaries(self):
+        """Return {bot: {opponent: (ScoreSummary, samples)}} for every cell of the score matrix."""
+        cells = {self.names[bot_path]: {} for bot_path in self.bot_paths}
+        for (bot1_path, bot2_path), samples in self.samples.items():
+            name1, name2 = self.names[bot1_path], self.names[bot2_path]
+            cells[name1][name2] = (summarize([sample[0] for sample in samples], self.confidence,
+                                             [sample[2] for sample in samples]), len(samples))
+            cells[name2][name1] = (summarize([sample[1] for sample in samples], self.confidence,
+                                             [sample[3] for sample in samples]), len(samples))
+        return cells
+
+    def bot_summaries(self, cells=None):
+        """Return (bot name, ScoreSummary) pairs sorted by mean average score."""
+        if cells is None:
+            cells = self.cell_summaries()
+        summaries = [(name, summarize_average(list(opponents.values()), self.confidence))
+                     for name, opponents in cells.items() if opponents]
+        return sorted(summaries, key=lambda item: item[1].mean, reverse=True)
+
+    def write_results(self):
+        """Write replicate_summary.txt and replicate_results.csv and return their directory."""
+        directory = new_run_dir(self.simulation.logs_dir, "replicates")
+
+        cells = self.cell_summaries()
+        bot_summaries = self.bot_summaries(cells)
+        name_width = max(len("Bot"), max(len(name) for name, _ in bot_summaries))
+        confidence_label = f"{self.confidence * 100:g}% CI"
+
+        with open(os.path.join(directory, "replicate_summary.txt"), 'w') as f:
+            f.write("="*50 + "\n")
+            f.write("REPLICATE TOURNAMENT SUMMARY\n")
+            f.write("="*50 + "\n\n")
+            f.write(f"Replicates: {self.replicates}\n")
+            f.write(f"Matches Played: {self.matches_played}\n")
+            if self.fixed_matches is not None:
+                f.write(f"Matches Saved: {self.fixed_matches - self.matches_played} "
+                        f"(compared with {self.fixed_matches} for a fixed number of replicates)\n")
+            f.write(f"Deterministic Pairings (played once): {len(self.deterministic)}\n")
+            f.write(f"Memory-One Pairings (scored exactly): {len({pairing[:2] for pairing, exact in self.exact.items() if exact is not None})}\n\n")
+
+            f.write("AVERAGE SCORE PER MATCH\n")
+            f.write("-"*50 + "\n")
+            f.write(f"{'Bot':<{name_width}} | {'Mean':>8} | {'Std':>8} | {confidence_label:^19}\n")
+            for name, summary in bot_summaries:
+                f.write(f"{name:<{name_width}} | {summary.mean:>8.1f} | {summary.std:>8.1f} | "
+                        f"{summary.low:>8.1f} - {summary.high:<8.1f}\n")
+
+        with open(os.path.join(directory, "replicate_results.csv"), 'w') as f:
+            f.write("Bot,Opponent,Mean,Std,CI Low,CI High,Samples\n")
+            for name, _ in bot_summaries:
+                for opponent, _ in bot_summaries:
+                    if opponent not in cells[name]:
+                        continue
+                    summary, count = cells[name][opponent]
+                    f.write(f"{name},{opponent},{summary.mean:.2f},{summary.std:.2f},"
+                            f"{summary.low:.2f},{summary.high:.2f},{count}\n")
+
+        return directory
+
+
+def _play_replicate(job):
+    """Play one match with the worker's simulation (see simulate_tournament._init_worker)
+    and report whether it drew anything from random."""
+    bot1_path, bot2_path, match_rounds, match_seed = job
+    simulation = simulate_tournament._worker_simulation
+    bot1 = simulation.load_bot(bot1_path)
+    bot2 = simulation.load_bot(bot2_path)
+
+    with isolated_random(match_seed):
+        seeded_state = random.getstate()
+        match_stats = simulation._run_match(bot1, bot2, match_rounds, None)
+        # A match that left the random state untouched would play the same with any seed
+        # (bots create their own streams from it, see AbstractBot.random)
+        deterministic = random.getstate() == seeded_state
+    return match_stats['scores'][bot1.name], match_stats['scores'][bot2.name], deterministic
@@ -0,0 +1,243 @@
+import multiprocessing
+import os
+import random
+import struct
+import time
+from utils.moves import Move
+from utils.event_bot import EventBot, bind_bot
+from utils.bot_loader import load_bot_class
+from utils.move_history import MatchHistory
+
+# Bots in this directory are sandboxed unless another one is given
+USER_BOTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bots', 'user-created')
+
+# What happens when a decision is not made in time
+TIMEOUT_POLICIES = ('defect', 'forfeit')
+
+# Returned by BotSandbox._request when the worker did not answer in time
+_TIMED_OUT = object()
+
+# Messages are bytes: a request number, a kind and a body. Requests load a bot file ('L',
+# body is the path), start a match and decide ('S', total rounds and random seed) or
+# observe the previous round and decide ('D', both moves). Answers carry the request
+# number, '+' or '!' for an error, and the bot name, the move or the error message.
+_HEADER = struct.Struct('<Ic')
+_SETUP = struct.Struct('<IQ')
+_MOVES = {move.value.encode(): move for move in Move}
+
+
+class BotSandbox:
+    """Long-lived worker processes in which untrusted bots make their decisions.
+
+    Every bot file in directory gets a worker process of its own that is reused for all
+    of its matches. Each decision must be answered within budget seconds. When it is
+    not, the bot defects that round. With on_timeout='defect' it keeps playing: before
+    it is asked again its worker is given up to LATE_TIMEOUT seconds to finish the late
+    decision, whose answer is dropped, so the next decision gets the full budget (a bot
+    whose late decision takes longer forfeits as below). With 'forfeit' its worker is
+    stopped and it defects for the rest of the match without being asked.
+
+    Requests and answers are a few bytes sent over a pipe; the moves of the previous
+    round travel with the next decision request, so a round costs one round trip. That
+    adds about 50-80 us to every decision, against a few us for a decision made
+    in-process, and cannot be batched since each decision depends on the opponent's
+    previous move, which is why only untrusted bots are sandboxed. Use the sandbox as
+    a context manager, or call close(), to stop the workers.
+    """
+    LOAD_TIMEOUT = 10.0  # Seconds a worker may take to load a bot file
+    LATE_TIMEOUT = 1.0  # Seconds a worker may take to finish a decision that timed out
+
+    def __init__(self, budget=0.05, on_timeout='defect', directory=USER_BOTS_DIR):
+        if on_timeout not in TIMEOUT_POLICIES:
+            raise ValueError(f"Unknown timeout policy: {on_timeout}")
+        self.budget = budget
+        self.on_timeout = on_timeout
+        self.directory = os.path.abspath(directory)
+        self._context = multiprocessing.get_context('spawn')
+        self._workers = {}  # Bot path -> (process, connection, bot name)
+        self._late = {}  # Bot path -> number of the request its worker has not answered in time
+        self._seq = 0
+
+    def settings(self):
+        """Arguments that create an equivalent sandbox, for example in another process."""
+        return self.budget, self.on_timeout, self.directory
+
+    def isolates(self, bot_path):
+        """Whether a bot file is played in the sandbox."""
+        path = os.path.abspath(bot_path)
+        return os.path.commonpath([path, self.directory]) == self.directory
+
+    def load(self, bot_path):
+        """Return a SandboxedBot for a bot file, starting its worker if needed."""
+        return SandboxedBot(self, bot_path, self._worker(bot_path)[2])
+
+    def _worker(self, bot_path):
+        worker = self._workers.get(bot_path)
+        if worker is not None and worker[0].is_alive():
+            return worker
+
+        connection, child_connection = self._context.Pipe()
+        process = self._context.Process(target=_serve, args=(child_connection,), daemon=True)
+        process.start()
+        child_connection.close()
+        self._workers[bot_path] = (process, connection, None)
+        name = self._request(bot_path, b'L', os.path.abspath(bot_path).encode(), self.LOAD_TIMEOUT)
+        if name is _TIMED_OUT:
+            self._stop(bot_path)
+            raise TimeoutError(f"Loading {bot_path} took longer than {self.LOAD_TIMEOUT} seconds")
+        self._workers[bot_path] = (process, connection, name.decode())
+        return self._workers[bot_path]
+
+    def _request(self, bot_path, kind, body, timeout):
+        _, connection, _ = self._workers[bot_path]
+        self._seq += 1
+        seq = self._seq
+        try:
+            connection.send_bytes(_HEADER.pack(seq, kind) + body)
+            answer = self._receive(bot_path, seq, timeout)
+        except (EOFError, OSError):
+            self._stop(bot_path)
+            raise Exception(f"Sandbox worker of {bot_path} stopped unexpectedly")
+        if answer is None:
+            self._late[bot_path] = seq
+            return _TIMED_OUT
+        if answer[4:5] == b'!':
+            raise Exception(f"Bot {bot_path} failed: {answer[_HEADER.size:].decode()}")
+        return answer[_HEADER.size:]
+
+    def _receive(self, bot_path, seq, timeout):
+        """Return the answer to request seq, or None if it does not come within timeout seconds."""
+        _, connection, _ = self._workers[bot_path]
+        deadline = time.perf_counter() + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not connection.poll(remaining):
+                return None
+            answer = connection.recv_bytes()
+            if _HEADER.unpack_from(answer)[0] == seq:
+                return answer
+
+    def _finish_late(self, bot_path):
+        """Wait for the worker to answer a request that timed out; return whether it did."""
+        seq = self._late.pop(bot_path, None)
+        if seq is None:
+            return True
+        try:
+            # The answer itself is dropped, the bot already defected in its place
+            return self._receive(bot_path, seq, self.LATE_TIMEOUT) is not None
+        except (EOFError, OSError):
+            return False
+
+    def decide(self, bot, setup, last_round):
+        """Ask a bot's worker for its next move; see SandboxedBot.decide."""
+        if not self._finish_late(bot.bot_path):
+            # A worker that does not catch up is stopped instead of making every later request wait
+            self._stop(bot.bot_path)
+            bot.forfeited = True
+            return Move.DEFECT
+        if setup is not None:
+            answer = self._request(bot.bot_path, b'S', _SETUP.pack(*setup), self.budget)
+        else:
+            my_move, opponent_move = last_round
+            answer = self._request(bot.bot_path, b'D', (my_move.value + opponent_move.value).encode(), self.budget)
+        if answer is not _TIMED_OUT:
+            return _MOVES[answer]
+        bot.timeouts += 1
+        if self.on_timeout == 'forfeit':
+            self._stop(bot.bot_path)
+            bot.forfeited = True
+        return Move.DEFECT
+
+    def _stop(self, bot_path):
+        self._late.pop(bot_path, None)
+        process, connection, _ = self._workers.pop(bot_path)
+        connection.close()
+        process.terminate()
+        process.join()
+
+    def close(self):
+        """Stop all worker processes."""
+        for bot_path in list(self._workers):
+            self._stop(bot_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SandboxedBot(EventBot):
+    """Stands in for a bot that plays in a sandbox worker process.
+
+    A new instance of the bot is created in the worker at the first decision of every
+    match, with the global random module there seeded from the one in this process, so
+    seeded tournaments stay reproducible (bots that use random play differently than
+    in-process ones, though). Hooks such as move_schedule or state_key are not asked
+    for, so sandboxed bots are always played round by round.
+    """
+    def __init__(self, sandbox, bot_path, name):
+        super().__init__()
+        self.sandbox = sandbox
+        self.bot_path = bot_path
+        self._name = name
+        self.timeouts = 0  # Decisions in this match that were not made in time
+        self.forfeited = False
+        self._started = False
+        self._last_round = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def spawn(self):
+        """Return a stand-in for a new instance of the bot, for the next match."""
+        # A worker stopped after a forfeit is started again before the match
+        self.sandbox._worker(self.bot_path)
+        return SandboxedBot(self.sandbox, self.bot_path, self._name)
+
+    def decide(self) -> Move:
+        if self.forfeited:
+            return Move.DEFECT
+        setup = None
+        if not self._started:
+            setup = (self.total_rounds, random.getrandbits(64))
+            self._started = True
+        return self.sandbox.decide(self, setup, self._last_round)
+
+    def observe(self, my_move: Move, opponent_move: Move):
+        self._last_round = (my_move, opponent_move)
+
+
+def _serve(connection):
+    """Main loop of a sandbox worker process."""
+    bot_class = None
+    decide = observe = history = None
+    while True:
+        try:
+            request = connection.recv_bytes()
+        except EOFError:
+            return
+        seq, kind = _HEADER.unpack_from(request)
+        body = request[_HEADER.size:]
+        try:
+            if kind == b'L':
+                bot_class = load_bot_class(body.decode())
+                answer = bot_class().name.encode()
+            else:
+                if kind == b'S':
+                    total_rounds, seed = _SETUP.unpack(body)
+                    random.seed(seed)
+                    bot = bot_class()
+                    bot.total_rounds = total_rounds
+                    history = MatchHistory()
+                    decide, observe = bind_bot(bot, history, 0)
+                else:
+                    my_move, opponent_move = _MOVES[body[:1]], _MOVES[body[1:]]
+                    history.append(my_move, opponent_move)
+                    observe(my_move, opponent_move)
+                answer = decide().value.encode()
+        except Exception as e:
+            connection.send_bytes(_HEADER.pack(seq, b'!') + f"{type(e).__name__}: {e}".encode())
+        else:
+            connection.send_bytes(_HEADER.pack(seq, b'+') + answer)
@@ -1,15 +1,40 @@
-import importlib.util
-from utils.abstract_bot import AbstractBot
 from utils.moves import Move
 from utils.game_config import GameConfig
+from utils.bot_loader import load_bot
+from utils.move_history import MatchHistory
+from utils.event_bot import bind_bot
+from simulation.match_record import MatchRecord, encode_match_record, write_match_record, RECORD_EXTENSION
+from simulation.match_log import render_match_log, render_match_record
+from simulation.match_cache import match_key
+from simulation.events import MatchEvent
+from simulation.bot_timing import DecisionTiming, merge_timings, write_timing_csv, timing_summary
+from simulation.simulate_tournament import new_run_dir
+from utils.seeding import isolated_random, new_tournament_seed
 from datetime import datetime
 import os
 import random
 
+# Labels of the betrayal lines in match logs of this mode
+GAMES_BETRAYAL_LABELS = ("Bot 1 Betrayals", "Opponent Betrayals")
+
 class PrisonersDilemmaSimulation:
-    def __init__(self, bot1_path):
+    def __init__(self, bot1_path, log_format='text', time_decisions=False):
         self.bot1_path = bot1_path  # Store path instead of instance
         
+        # 'text' writes the formatted round history of every match,
+        # 'binary' writes a compact match record instead (see match_record.py),
+        # 'lazy' keeps the packed moves in memory and writes them to a single
+        # archive; text logs are rendered only on request
+        if log_format not in ('text', 'binary', 'lazy'):
+            raise ValueError(f"Unknown log format: {log_format}")
+        self.log_format = log_format
+        # Whether to measure how long bots take to decide, which adds about 1 us to every decision
+        # (two clock reads and a histogram update); when off, moves are asked for directly
+        self.time_decisions = time_decisions
+        self.match_records = {}
+        self.seed = None  # Seed of the last run_games
+        self.cancelled = False  # Whether the last run_games was cancelled before all games were played
+        
         self.logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
         if not os.path.exists(self.logs_dir):
             os.makedirs(self.logs_dir)
@@ -17,15 +42,7 @@ class PrisonersDilemmaSimulation:
     def load_bot(self, path):
         """Load a bot from a file path"""
         try:
-            spec = importlib.util.spec_from_file_location("bot_module", path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
-            for item in dir(module):
-                obj = getattr(module, item)
-                if isinstance(obj, type) and issubclass(obj, AbstractBot) and obj != AbstractBot:
-                    return obj()
-            raise ValueError("No valid bot class found in file")
+            return load_bot(path)
         except Exception as e:
             raise Exception(f"Error loading bot from {path}: {e}")
 
@@ -40,17 +57,31 @@ class PrisonersDilemmaSimulation:
         else:  # both defect
             return GameConfig.MUTUAL_DEFECTION_POINTS, GameConfig.MUTUAL_DEFECTION_POINTS
 
-    def run_games(self, opponent_paths, rounds=GameConfig.NUMBER_OF_ROUNDS):
-        """Run games against multiple opponents."""
+    def run_games(self, opponent_paths, rounds=GameConfig.NUMBER_OF_ROUNDS, seed=None, progress=None, cancel=None):
+        """Run games against multiple opponents.
+        
+        Every match seeds the global random module from the seed and both bot files, so
+        the games can be played again with the same seed. Without a seed a new one is
+        picked and kept in self.seed.
+
+        progress and cancel work as in TournamentSimulation.run_all_against_all: once
+        cancel is set no new games are started and the summary covers the games played.
+        """
+        self.seed = seed if seed is not None else new_tournament_seed()
+        rng = random.Random(self.seed)
         # Create fresh instance of bot1
         self.bot1 = self.load_bot(self.bot1_path)
         
-        timestamp = datetime.now().strftime("%H%M%S")
-        games_dir = os.path.join(self.logs_dir, f"{timestamp}_{self.bot1.name}_games")
-        os.makedirs(games_dir)
+        games_dir = new_run_dir(self.logs_dir, f"{self.bot1.name}_games")
 
         all_stats = []
-        for opponent_path in opponent_paths:
+        self.match_records = {}
+        self.cancelled = False
+        for game, opponent_path in enumerate(opponent_paths):
+            if cancel is not None and cancel.is_set():
+                self.cancelled = True
+                break
+            
             # Load opponent bot
             opponent = self.load_bot(opponent_path)
             
@@ -59,19 +90,40 @@ class PrisonersDilemmaSimulation:
             if GameConfig.ADD_NOISE:
                 min_rounds = int(rounds * 0.8)
                 max_rounds = int(rounds * 1.2)
-                match_rounds = random.randint(min_rounds, max_rounds)
+                match_rounds = rng.randint(min_rounds, max_rounds)
 
-            match_stats = self._run_match(opponent, match_rounds, games_dir)
+            match_seed = match_key(self.bot1_path, opponent_path, match_rounds, self.seed)
+            with isolated_random(match_seed):
+                match_stats = self._run_match(opponent, match_rounds, games_dir, game)
             all_stats.append({
                 'opponent': opponent.name,
                 'stats': match_stats
             })
+            if progress is not None:
+                progress(MatchEvent(len(all_stats), len(opponent_paths), self.bot1.name, opponent.name, match_rounds,
+                                    match_stats['scores'][self.bot1.name], match_stats['scores'][opponent.name],
+                                    match_stats['mutual_cooperation'], match_stats['mutual_defection'],
+                                    match_stats['bot1_betrayals'], match_stats['opponent_betrayals']))
+
+        # In lazy mode all match records go to a single archive file
+        if self.log_format == 'lazy':
+            with open(os.path.join(games_dir, f"matches{RECORD_EXTENSION}"), 'wb') as f:
+                f.write(b''.join(self.match_records.values()))
 
         # Write summary of all games
-        self._write_games_summary(games_dir, all_stats)
+        if all_stats:
+            self._write_games_summary(games_dir, all_stats)
+            if self.time_decisions:
+                timings = {}
+                for stat in all_stats:
+                    merge_timings(stat['stats']['timing'], timings)
+                write_timing_csv(games_dir, timings)
+                with open(os.path.join(games_dir, "games_summary.txt"), 'a') as f:
+                    f.write("\n" + timing_summary(timings))
         print(f"Games complete. Results saved to {games_dir}")
+        return games_dir
 
-    def _run_match(self, opponent, rounds, tournament_dir):
+    def _run_match(self, opponent, rounds, tournament_dir, game=None):
         # Reinitialize both bots for this match
         bot1 = self.load_bot(self.bot1_path)
         opponent_class = opponent.__class__
@@ -85,78 +137,68 @@ class PrisonersDilemmaSimulation:
             'scores': {bot1.name: 0, opponent.name: 0}
         }
 
-        timestamp = datetime.now().strftime("%H%M%S")
-        log_filename = f"{timestamp}_vs_{opponent.name}.txt"
-        log_path = os.path.join(tournament_dir, log_filename)
-
-        output_lines = []
-        output_lines.extend([
-            "="*50,
-            f"MATCH RESULTS - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-            f"Bot 1: {bot1.name}",
-            f"Bot 2: {opponent.name}",
-            "="*50,
-            "",
-            "ROUND HISTORY:",
-            f"{'Round':^6} | {'Bot 1':^10} | {'Bot 2':^10} | {'Round Result':^12} | {'Current Score':^12}",
-            "-"*60
-        ])
+        # Both bots read their histories from one shared buffer for this match
+        history = MatchHistory()
+        decide1, observe1 = bind_bot(bot1, history, 0)
+        decide2, observe2 = bind_bot(opponent, history, 1)
+        if self.time_decisions:
+            stats['timing'] = {bot1.name: DecisionTiming(), opponent.name: DecisionTiming()}
+            decide1 = stats['timing'][bot1.name].timed(decide1)
+            decide2 = stats['timing'][opponent.name].timed(decide2)
 
         for round_num in range(rounds):
-            move1 = bot1.make_decision()  # Change strategy([]) to make_decision()
-            move2 = opponent.make_decision()   # Change strategy([]) to make_decision()
+            move1 = decide1()
+            move2 = decide2()
 
             # Update histories for both bots
-            bot1.my_history.append(move1)
-            bot1.opponent_history.append(move2)
-            opponent.my_history.append(move2)
-            opponent.opponent_history.append(move1)
+            history.append(move1, move2)
+            observe1(move1, move2)
+            observe2(move2, move1)
 
             # Calculate score and determine round result
             if move1 == Move.COOPERATE and move2 == Move.COOPERATE:
-                round_result = f"{GameConfig.MUTUAL_COOPERATION_POINTS:^2} - {GameConfig.MUTUAL_COOPERATION_POINTS:^2}"
                 score1, score2 = GameConfig.MUTUAL_COOPERATION_POINTS, GameConfig.MUTUAL_COOPERATION_POINTS
                 stats['mutual_cooperation'] += 1
             elif move1 == Move.COOPERATE and move2 == Move.DEFECT:
-                round_result = f"{GameConfig.BETRAYED_POINTS:^2} - {GameConfig.BETRAYAL_POINTS:^2}"
                 score1, score2 = GameConfig.BETRAYED_POINTS, GameConfig.BETRAYAL_POINTS
                 stats['opponent_betrayals'] += 1
             elif move1 == Move.DEFECT and move2 == Move.COOPERATE:
-                round_result = f"{GameConfig.BETRAYAL_POINTS:^2} - {GameConfig.BETRAYED_POINTS:^2}"
                 score1, score2 = GameConfig.BETRAYAL_POINTS, GameConfig.BETRAYED_POINTS
                 stats['bot1_betrayals'] += 1
             else:  # Both defect
-                round_result = f"{GameConfig.MUTUAL_DEFECTION_POINTS:^2} - {GameConfig.MUTUAL_DEFECTION_POINTS:^2}"
                 score1, score2 = GameConfig.MUTUAL_DEFECTION_POINTS, GameConfig.MUTUAL_DEFECTION_POINTS
                 stats['mutual_defection'] += 1
 
             stats['scores'][bot1.name] += score1
             stats['scores'][opponent.name] += score2
 
-            current_score = f"{stats['scores'][bot1.name]:^5} - {stats['scores'][opponent.name]:^5}"
-            output_lines.append(f"{round_num+1:^6} | {move1.name:^10} | {move2.name:^10} | {round_result:^12} | {current_score}")
-
-        output_lines.extend([
-            "\nMATCH STATISTICS:",
-            "-"*50,
-            f"Total Rounds: {rounds}",
-            f"Mutual Cooperation: {stats['mutual_cooperation']} ({stats['mutual_cooperation']/rounds*100:.1f}%)",
-            f"Mutual Defection: {stats['mutual_defection']} ({stats['mutual_defection']/rounds*100:.1f}%)",
-            f"Bot 1 Betrayals: {stats['bot1_betrayals']} ({stats['bot1_betrayals']/rounds*100:.1f}%)",
-            f"Opponent Betrayals: {stats['opponent_betrayals']} ({stats['opponent_betrayals']/rounds*100:.1f}%)",
-            "",
-            "FINAL SCORES:",
-            "-"*50,
-            f"{bot1.name}: {stats['scores'][bot1.name]}",
-            f"{opponent.name}: {stats['scores'][opponent.name]}",
-            "="*50
-        ])
-
-        with open(log_path, 'w') as log_file:
-            log_file.write('\n'.join(output_lines))
+        # Write the match log, or keep only the packed moves in lazy mode
+        timestamp = datetime.now().strftime("%H%M%S")
+        if self.log_format == 'text':
+            log_path = os.path.join(tournament_dir, f"{timestamp}_vs_{opponent.name}.txt")
+            with open(log_path, 'w') as log_file:
+                log_file.write(render_match_log(bot1.name, opponent.name, history.view(0), history.view(1),
+                                                betrayal_labels=GAMES_BETRAYAL_LABELS))
+        elif self.log_format == 'binary':
+            log_path = os.path.join(tournament_dir, f"{timestamp}_vs_{opponent.name}{RECORD_EXTENSION}")
+            write_match_record(log_path, bot1.name, opponent.name, history.view(0), history.view(1))
+        else:
+            # Keyed by game, since the same opponent may be listed more than once
+            self.match_records[game] = encode_match_record(bot1.name, opponent.name,
+                                                           history.view(0), history.view(1))
 
         return stats
 
+    def render_match(self, game=None):
+        """Render the text log of a lazy-mode match, by default the most recent one.
+
+        game is the position of the opponent in the opponent_paths given to run_games.
+        """
+        if game is None:
+            game = list(self.match_records)[-1]
+        return render_match_record(MatchRecord(self.match_records[game]),
+                                   betrayal_labels=GAMES_BETRAYAL_LABELS)
+
     def _write_games_summary(self, directory, all_stats):
         """Write a summary of all games played."""
         summary_path = os.path.join(directory, "games_summary.txt")
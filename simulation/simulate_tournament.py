@@ -1,41 +1,241 @@
 from datetime import datetime
 import os
-from utils.abstract_bot import AbstractBot
 from utils.moves import Move
-from utils.game_config import GameConfig
-import importlib.util
+from utils.game_config import GameConfig, payoffs
+from utils.bot_loader import load_bot
+from utils.move_history import MatchHistory
+from utils.event_bot import bind_bot
+from simulation.match_record import MatchRecord, encode_match_record, RECORD_EXTENSION
+from simulation.match_cache import match_key, file_digest
+from simulation.tournament_results import write_tournament_results, load_tournament_results, load_tournament_seed
+from simulation.match_log import render_match_log, render_match_record
+from simulation.events import match_event
+from simulation.bot_timing import DecisionTiming, merge_timings, write_timing_csv, timing_summary
+from simulation.sandbox import BotSandbox, SandboxedBot
+from simulation.vectorized import (play_table_matches, vectorized_available,
+                                   pack_schedule, schedule_outcome_counts)
+from utils.strategy_table import get_strategy_table, get_move_schedule, provides_state_key
+from utils.seeding import isolated_random, new_tournament_seed
 import random
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+
+def new_run_dir(logs_dir, name):
+    """Create and return the directory of a run, named after the current time and name.
+
+    Runs started within the same second get a counter suffix (_2, _3, ...) instead of
+    sharing a directory.
+    """
+    base = os.path.join(logs_dir, f"{datetime.now().strftime('%H%M%S')}_{name}")
+    directory = base
+    count = 1
+    while True:
+        try:
+            os.makedirs(directory)
+            return directory
+        except FileExistsError:
+            count += 1
+            directory = f"{base}_{count}"
+
 
 class TournamentSimulation:
-    def __init__(self):
+    def __init__(self, log_format='text', config=None, time_decisions=False, sandbox=None):
+        # 'text' writes the formatted round history of every match,
+        # 'binary' writes a compact match record instead (see match_record.py),
+        # 'lazy' keeps the packed moves in memory and writes them to a single
+        # archive per tournament; text logs are rendered only on request
+        if log_format not in ('text', 'binary', 'lazy'):
+            raise ValueError(f"Unknown log format: {log_format}")
+        self.log_format = log_format
+        # Payoffs, default match length and noise; GameConfig itself unless a run has its own
+        self.config = config if config is not None else GameConfig
+        # Whether to measure how long bots take to decide, which adds about 1 us to every decision
+        # (two clock reads and a histogram update); when off, moves are asked for directly
+        self.time_decisions = time_decisions
+        # A BotSandbox whose bots are played in worker processes with a time budget per decision
+        self.sandbox = sandbox
+        self.match_records = {}
+        self.seed = None  # Seed of the last tournament
+        self.cancelled = False  # Whether the last tournament was cancelled before all matches finished
+        self._move_schedules = {}
         self.logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
         os.makedirs(self.logs_dir, exist_ok=True)
 
     def load_bot(self, bot_path):
         """Load a bot from a file path."""
         try:
-            spec = importlib.util.spec_from_file_location("bot_module", bot_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
-            for item in dir(module):
-                obj = getattr(module, item)
-                if isinstance(obj, type) and issubclass(obj, AbstractBot) and obj != AbstractBot:
-                    return obj()
-            raise ValueError("No valid bot class found in file")
+            if self.sandbox is not None and self.sandbox.isolates(bot_path):
+                return self.sandbox.load(bot_path)
+            return load_bot(bot_path)
         except Exception as e:
             raise Exception(f"Failed to load bot: {str(e)}")
 
-    def run_all_against_all(self, bot_paths, rounds=GameConfig.NUMBER_OF_ROUNDS, visualize=False):
+    def run_all_against_all(self, bot_paths, rounds=None, visualize=False, workers=1, vectorize=True,
+                            cache=None, seed=None, previous=None, progress=None, cancel=None):
         """Conduct a round-robin tournament where each bot plays against each other.
         
-        If GameConfig.ADD_NOISE is True, the number of rounds per match will vary randomly
+        rounds defaults to the config's NUMBER_OF_ROUNDS. If its ADD_NOISE is True, the number of rounds per match will vary randomly
         between 80% and 120% of the specified rounds value.
+
+        If workers is greater than 1 (or None for one per CPU), pairings are played in a
+        pool of worker processes. Results are merged in pairing order, so the scores,
+        statistics and results.csv are the same as for a serial run.
+
+        Pairings between two bots with a move_schedule are scored directly from their
+        schedules. If vectorize is True and NumPy is installed, pairings where both bots
+        provide a strategy_table are played together by the vectorized engine (see
+        vectorized.py).
+
+        Round counts come from a random stream seeded by the tournament seed, and every
+        match seeds the global random module from the tournament seed and the pairing,
+        so serial and parallel runs play the same. Without a seed a new one is picked
+        and kept in self.seed. If seed is given, matches found in cache (a MatchCache)
+        are taken from it instead of being played; unseeded tournaments never use the
+        cache.
+
+        If previous is the directory of an earlier tournament played with the same
+        settings and seed (its seed is used unless another one is given), matches
+        between bots whose files have not changed since are taken from its results,
+        and only pairings involving new or changed bots are played.
+
+        If decisions are timed, bot_timing.csv and a summary section report how long
+        every bot took per decision in the matches played (not those taken from a cache,
+        a previous tournament or move schedules, nor rounds skipped as repeating cycles).
+
+        With a sandbox (see sandbox.py), the bots it isolates make their decisions in
+        worker processes within a time budget, and the summary counts the decisions that
+        ran over it. Such matches depend on timing, so the cache is not used.
+
+        progress, if given, is called with a MatchEvent (see events.py) after every
+        finished match. cancel is an object with is_set(), such as a threading.Event;
+        once it is set no new matches are started, self.cancelled becomes True and the
+        results only cover the matches finished so far.
         """
-        timestamp = datetime.now().strftime("%H%M%S")
-        tournament_dir = os.path.join(self.logs_dir, f"{timestamp}_tournament")
-        os.makedirs(tournament_dir)
+        if rounds is None:
+            rounds = self.config.NUMBER_OF_ROUNDS
+        if self.sandbox is not None:
+            cache = None
+        # An incremental tournament keeps the random streams of the one it builds on
+        if seed is None and previous is not None:
+            seed = load_tournament_seed(previous)
+        self.seed = seed if seed is not None else new_tournament_seed()
+        tournament_dir = new_run_dir(self.logs_dir, "tournament")
+
+        # Schedule matches between all pairs of bots
+        pairings, remaining_rounds = self._schedule_pairings(bot_paths, rounds, random.Random(self.seed))
+
+        # Bots are identified by the contents of their files, so renamed bots are still recognised
+        digests = {bot_path: file_digest(bot_path) for bot_path in bot_paths}
+        results = [None] * len(pairings)
+
+        # In an incremental tournament, matches between unchanged bots come from the previous one
+        self.reused_matches = 0
+        if previous is not None:
+            self.reused_matches = self._reuse_previous_matches(previous, pairings, digests, rounds, results, tournament_dir)
+
+        # Each match is seeded from its cache key, so a cached result is exactly what replaying it would give
+        match_seeds = [match_key(bot1_path, bot2_path, match_rounds, self.seed, self.config)
+                       for _, _, bot1_path, bot2_path, match_rounds in pairings]
+        if cache is not None and seed is not None:
+            for k, (bot1, bot2, _, _, _) in enumerate(pairings):
+                cached = cache.get(match_seeds[k])
+                if cached is not None:
+                    match_stats, record = cached
+                    moves1, moves2 = MatchRecord(record).moves()
+                    results[k] = self._log_match(bot1.name, bot2.name, moves1, moves2, match_stats, tournament_dir)
+        missed = [k for k, match_stats in enumerate(results) if match_stats is None]
 
+        # Pairings between two bots with fixed move schedules are scored without playing them
+        self._run_schedule_matches(pairings, results, tournament_dir)
+
+        # Pairings between table-driven bots are all played at once on NumPy arrays
+        if vectorize and vectorized_available():
+            self._run_table_matches(pairings, results, tournament_dir)
+        # Matches are played in round-robin rounds, so early results cover every bot evenly
+        order = self._interleaved_order(len(bot_paths))
+        remaining = [k for k in order if results[k] is None]
+
+        # Matches that needed no playing are reported first
+        finished = 0
+        def report(k):
+            nonlocal finished
+            finished += 1
+            if progress is not None:
+                progress(match_event(finished, len(pairings), pairings[k][0].name, pairings[k][1].name, results[k]))
+        for k in order:
+            if results[k] is not None:
+                report(k)
+
+        # Run the other matches, either one after another or spread over worker processes
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1 and len(remaining) > 1:
+            jobs = {k: (pairings[k][2], pairings[k][3], pairings[k][4], tournament_dir, match_seeds[k]) for k in remaining}
+            chunksize = max(1, len(jobs) // (workers * 4))
+            chunks = [remaining[i:i + chunksize] for i in range(0, len(remaining), chunksize)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.log_format, self.config, self.time_decisions,
+                                               self.sandbox.settings() if self.sandbox is not None else None)) as executor:
+                # Only a few chunks per worker are queued at a time, so a cancel takes effect soon
+                running = {}
+                while chunks or running:
+                    while chunks and len(running) < workers * 2 and not (cancel is not None and cancel.is_set()):
+                        chunk = chunks.pop(0)
+                        running[executor.submit(_play_pairings, [jobs[k] for k in chunk])] = chunk
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for k, match_stats in zip(running.pop(future), future.result()):
+                            results[k] = match_stats
+                            report(k)
+        else:
+            for k in remaining:
+                if cancel is not None and cancel.is_set():
+                    break
+                bot1, bot2, _, _, match_rounds = pairings[k]
+                results[k] = self._run_match(bot1, bot2, match_rounds, tournament_dir, match_seeds[k])
+                report(k)
+
+        if cache is not None and seed is not None:
+            for k in missed:
+                if results[k] is not None:
+                    cache.put(match_seeds[k], results[k], results[k]['record'])
+            cache.evict()
+
+        # A cancelled tournament only covers the matches finished before it stopped
+        self.cancelled = finished < len(pairings)
+        played = [k for k, match_stats in enumerate(results) if match_stats is not None]
+        pairings = [pairings[k] for k in played]
+        results = [results[k] for k in played]
+
+        # Verify all bots played their expected number of rounds
+        for bot_path, remaining in remaining_rounds.items():
+            if remaining != 0 and not self.cancelled:
+                print(f"Warning: {os.path.basename(bot_path)} has {remaining} unplayed rounds")
+
+        # In lazy mode all match records go to a single archive file
+        self.match_records = {}
+        if self.log_format == 'lazy':
+            for (bot1, bot2, _, _, _), match_stats in zip(pairings, results):
+                self.match_records[(bot1.name, bot2.name)] = match_stats['record']
+            with open(os.path.join(tournament_dir, f"matches{RECORD_EXTENSION}"), 'wb') as f:
+                f.write(b''.join(self.match_records.values()))
+        
+        # Write summary, export CSV and keep the results for later incremental tournaments
+        if pairings:
+            self._write_results(tournament_dir, pairings, results, rounds)
+        write_tournament_results(tournament_dir, rounds, self.seed, self.config,
+                                 [(digests[bot1_path], digests[bot2_path], match_rounds, match_stats)
+                                  for (_, _, bot1_path, bot2_path, match_rounds), match_stats in zip(pairings, results)])
+        
+        return tournament_dir
+
+    def _write_results(self, tournament_dir, pairings, results, rounds):
+        """Merge the statistics of all matches and write tournament_summary.txt and results.csv.
+        
+        Returns the bot names ranked by average score.
+        """
         # Track scores and statistics
         scores = {}
         matches_played = {}
@@ -44,126 +244,173 @@ class TournamentSimulation:
             'mutual_defection': 0,
             'betrayals': {}  # Will track betrayals per bot
         }
+        for bot1, bot2, _, _, _ in pairings:
+            for bot_name in [bot1.name, bot2.name]:
+                scores.setdefault(bot_name, 0)
+                matches_played.setdefault(bot_name, 0)
+                stats['betrayals'].setdefault(bot_name, 0)
 
+        # Merge match results in pairing order
+        match_scores = {bot_name: {} for bot_name in scores}
+        for (bot1, bot2, _, _, _), match_stats in zip(pairings, results):
+            match_scores[bot1.name][bot2.name] = match_stats['scores'][bot1.name]
+            match_scores[bot2.name][bot1.name] = match_stats['scores'][bot2.name]
+
+            # Update scores and statistics
+            scores[bot1.name] += match_stats['scores'][bot1.name]
+            scores[bot2.name] += match_stats['scores'][bot2.name]
+            matches_played[bot1.name] += 1
+            matches_played[bot2.name] += 1
+            
+            stats['mutual_cooperation'] += match_stats['mutual_cooperation']
+            stats['mutual_defection'] += match_stats['mutual_defection']
+            stats['betrayals'][bot1.name] += match_stats['betrayals'][bot1.name]
+            stats['betrayals'][bot2.name] += match_stats['betrayals'][bot2.name]
+
+        # After matches are done and before writing summary
+        bot_stats = []
+        for bot_name in scores.keys():
+            avg_score = scores[bot_name] / matches_played[bot_name]
+            bot_stats.append((bot_name, avg_score))
+        
+        # Sort bots by average score
+        bot_names = [bot[0] for bot in sorted(bot_stats, key=lambda x: x[1], reverse=True)]
+        display_names = {name: name.replace(" Bot", "").strip() for name in bot_names}
+        
+        # Create score matrix from the collected match results
+        score_matrix = {bot1: {bot2: match_scores[bot1].get(bot2, 0) for bot2 in bot_names} for bot1 in bot_names}
+        
+        self._write_tournament_summary(tournament_dir, scores, stats, matches_played, rounds, bot_names, display_names, score_matrix)
+        self._export_score_matrix_csv(directory=tournament_dir, bot_names=bot_names, display_names=display_names, score_matrix=score_matrix)
+
+        # Decision latencies of the matches that were played with timing on
+        timings = {}
+        for match_stats in results:
+            if 'timing' in match_stats:
+                merge_timings(match_stats['timing'], timings)
+        if timings:
+            write_timing_csv(tournament_dir, timings)
+            with open(os.path.join(tournament_dir, "tournament_summary.txt"), 'a') as f:
+                f.write("\n\n" + timing_summary(timings))
+
+        # Decisions of sandboxed bots that ran over the time budget
+        timeouts = {}
+        for match_stats in results:
+            for bot_name, count in match_stats.get('timeouts', {}).items():
+                timeouts[bot_name] = timeouts.get(bot_name, 0) + count
+        if timeouts:
+            with open(os.path.join(tournament_dir, "tournament_summary.txt"), 'a') as f:
+                f.write(f"\n\nDECISION TIMEOUTS ({self.sandbox.budget * 1000:g} ms budget, {self.sandbox.on_timeout})\n")
+                f.write("-"*50 + "\n")
+                for bot_name, count in sorted(timeouts.items(), key=lambda item: item[1], reverse=True):
+                    f.write(f"{bot_name}: {count}\n")
+        return bot_names
+
+    def _schedule_pairings(self, bot_paths, rounds, rng):
+        """Pair every bot with every other bot and choose the number of rounds of each match.
+        
+        Noisy round counts are drawn from rng, a random.Random instance.
+        Returns the (bot1, bot2, bot1_path, bot2_path, match_rounds) pairings and the
+        rounds each bot has left unplayed, which is zero for every bot.
+        """
         # Calculate total rounds each bot should play
         num_opponents = len(bot_paths) - 1
         total_rounds_per_bot = num_opponents * rounds
         remaining_rounds = {bot_path: total_rounds_per_bot for bot_path in bot_paths}
 
-        # Run matches between all pairs of bots
+        # Every match length is fixed up front, so the totals are balanced before any match starts
+        if self.config.ADD_NOISE:
+            match_lengths = self._noisy_match_rounds(len(bot_paths), rounds, rng)
+
+        # Schedule matches between all pairs of bots
+        pairings = []
         for i, bot1_path in enumerate(bot_paths):
             bot1 = self.load_bot(bot1_path)
-            stats['betrayals'][bot1.name] = 0
+            bot1.total_rounds = self.config.NUMBER_OF_ROUNDS
             
             for j, bot2_path in enumerate(bot_paths[i+1:], i+1):
                 bot2 = self.load_bot(bot2_path)
-                if j == i: continue  # Skip self-play
-                
-                if bot2.name not in stats['betrayals']:
-                    stats['betrayals'][bot2.name] = 0
-
-                # Initialize scores if needed
-                for bot_name in [bot1.name, bot2.name]:
-                    scores.setdefault(bot_name, 0)
-                    matches_played.setdefault(bot_name, 0)
-
-                # Calculate rounds for this match while maintaining total
-                if GameConfig.ADD_NOISE:
-                    min_rounds = int(rounds * 0.8)
-                    max_rounds = int(rounds * 1.2)
-                    
-                    # Calculate remaining matches for both bots (including current match)
-                    remaining_matches_bot1 = sum(1 for x in bot_paths[i+1:] if x != bot1_path)
-                    remaining_matches_bot2 = sum(1 for x in bot_paths[i:] if x != bot2_path)
-                    
-                    # Ensure we have valid remaining matches counts
-                    if remaining_matches_bot1 == 0 or remaining_matches_bot2 == 0:
-                        match_rounds = remaining_rounds[bot1_path] if remaining_matches_bot1 == 0 else remaining_rounds[bot2_path]
-                    else:
-                        # Calculate average rounds needed per remaining match
-                        avg_rounds_bot1 = remaining_rounds[bot1_path] // remaining_matches_bot1
-                        avg_rounds_bot2 = remaining_rounds[bot2_path] // remaining_matches_bot2
-                        
-                        # Set bounds for this match
-                        match_min = max(min_rounds, min(avg_rounds_bot1, avg_rounds_bot2))
-                        match_max = min(max_rounds, 
-                                      remaining_rounds[bot1_path],
-                                      remaining_rounds[bot2_path])
-                        
-                        match_rounds = random.randint(match_min, max(match_min, match_max))
-                else:
-                    match_rounds = rounds
+                bot2.total_rounds = self.config.NUMBER_OF_ROUNDS
+                match_rounds = match_lengths[(i, j)] if self.config.ADD_NOISE else rounds
 
                 # Update remaining rounds
                 remaining_rounds[bot1_path] -= match_rounds
                 remaining_rounds[bot2_path] -= match_rounds
 
-                # Run match
-                match_stats = self._run_match(bot1, bot2, match_rounds, tournament_dir)
-                
-                # Update scores and statistics
-                scores[bot1.name] += match_stats['scores'][bot1.name]
-                scores[bot2.name] += match_stats['scores'][bot2.name]
-                matches_played[bot1.name] += 1
-                matches_played[bot2.name] += 1
-                
-                stats['mutual_cooperation'] += match_stats['mutual_cooperation']
-                stats['mutual_defection'] += match_stats['mutual_defection']
-                stats['betrayals'][bot1.name] += match_stats['betrayals'][bot1.name]
-                stats['betrayals'][bot2.name] += match_stats['betrayals'][bot2.name]
+                pairings.append((bot1, bot2, bot1_path, bot2_path, match_rounds))
 
-        # Verify all bots played their expected number of rounds
-        for bot_path, remaining in remaining_rounds.items():
-            if remaining != 0:
-                print(f"Warning: {os.path.basename(bot_path)} has {remaining} unplayed rounds")
+        return pairings, remaining_rounds
 
-        # After matches are done and before writing summary
-        bot_stats = []
-        for bot_name in scores.keys():
-            avg_score = scores[bot_name] / matches_played[bot_name]
-            bot_stats.append((bot_name, avg_score))
-        
-        # Sort bots by average score
-        bot_names = [bot[0] for bot in sorted(bot_stats, key=lambda x: x[1], reverse=True)]
-        display_names = {name: name.replace(" Bot", "").strip() for name in bot_names}
-        
-        # Create score matrix
-        score_matrix = {bot1: {bot2: 0 for bot2 in bot_names} for bot1 in bot_names}
+    def _interleaved_order(self, num_bots):
+        """Return the indices of the pairings made by _schedule_pairings in round-robin order.
+
+        Pairings are grouped into rounds (the circle method) in which every bot plays at
+        most one match, so any prefix of the order spreads the matches over all bots.
+        """
+        def index(i, j):
+            # Position of the pairing (i, j), i < j, in the order of _schedule_pairings
+            return i * num_bots - i * (i + 1) // 2 + j - i - 1
+
+        # With an odd number of bots, whoever is paired with the extra slot sits the round out
+        slots = list(range(num_bots)) + ([None] if num_bots % 2 else [])
+        order = []
+        for _ in range(len(slots) - 1):
+            for a, b in zip(slots[:len(slots) // 2], reversed(slots[len(slots) // 2:])):
+                if a is not None and b is not None:
+                    order.append(index(min(a, b), max(a, b)))
+            slots.insert(1, slots.pop())
+        return order
+
+    def _noisy_match_rounds(self, num_bots, rounds, rng):
+        """Return {(i, j): match rounds} for every pair i < j of bot indices.
         
-        # Fill score matrix from match results
-        for bot1 in bot_names:
-            for bot2 in bot_names:
-                if bot1 != bot2:
-                    match_file = os.path.join(tournament_dir, f"{bot1}_vs_{bot2}.txt")
-                    if os.path.exists(match_file):
-                        with open(match_file, 'r') as mf:
-                            for line in mf:
-                                if line.startswith(f"{bot1}: "):
-                                    score = int(line.split(": ")[1])
-                                    score_matrix[bot1][bot2] = score
-                    else:
-                        match_file = os.path.join(tournament_dir, f"{bot2}_vs_{bot1}.txt")
-                        if os.path.exists(match_file):
-                            with open(match_file, 'r') as mf:
-                                for line in mf:
-                                    if line.startswith(f"{bot1}: "):
-                                        score = int(line.split(": ")[1])
-                                        score_matrix[bot1][bot2] = score
+        Lengths vary between 80% and 120% of rounds while every bot plays exactly
+        (num_bots - 1) * rounds rounds in total. All matches start at rounds and are then
+        changed along random cycles of four bots a-b-c-d, adding k to a-b and c-d and
+        taking k from b-c and d-a, which leaves each bot's total unchanged. With fewer
+        than four bots, balanced totals leave no room for noise.
+        """
+        min_rounds = int(rounds * 0.8)
+        max_rounds = int(rounds * 1.2)
+        match_lengths = {(i, j): rounds for i in range(num_bots) for j in range(i + 1, num_bots)}
+        if num_bots < 4:
+            return match_lengths
+
+        def pair(a, b):
+            return (a, b) if a < b else (b, a)
+
+        for _ in range(len(match_lengths)):
+            a, b, c, d = rng.sample(range(num_bots), 4)
+            k = rng.randint(min_rounds - rounds, max_rounds - rounds)
+            added = [pair(a, b), pair(c, d)]
+            taken = [pair(b, c), pair(d, a)]
+            if (all(min_rounds <= match_lengths[p] + k <= max_rounds for p in added)
+                    and all(min_rounds <= match_lengths[p] - k <= max_rounds for p in taken)):
+                for p in added:
+                    match_lengths[p] += k
+                for p in taken:
+                    match_lengths[p] -= k
+        return match_lengths
+
+    def _run_match(self, bot1, bot2, rounds, tournament_dir, seed=None, total_rounds=None):
+        """Run a single match between two bots and return match statistics.
         
-        # Write summary and export CSV
-        self._write_tournament_summary(tournament_dir, scores, stats, matches_played, rounds, bot_names, display_names, score_matrix)
-        self._export_score_matrix_csv(directory=tournament_dir, bot_names=bot_names, display_names=display_names, score_matrix=score_matrix)
+        If seed is given, the match plays with the global random module seeded by it,
+        and the previous random state is restored afterwards. total_rounds is the match
+        length the bots are told, the config's NUMBER_OF_ROUNDS by default.
+        """
+        if seed is not None:
+            with isolated_random(seed):
+                return self._run_match(bot1, bot2, rounds, tournament_dir, total_rounds=total_rounds)
         
-        return tournament_dir
-
-    def _run_match(self, bot1, bot2, rounds, tournament_dir):
-        """Run a single match between two bots and return match statistics."""
         # Reinitialize bots for this match by creating new instances
-        bot1_class = bot1.__class__
-        bot2_class = bot2.__class__
-        bot1 = bot1_class()
-        bot2 = bot2_class()
+        bot1 = bot1.spawn() if isinstance(bot1, SandboxedBot) else bot1.__class__()
+        bot2 = bot2.spawn() if isinstance(bot2, SandboxedBot) else bot2.__class__()
+        if total_rounds is None:
+            total_rounds = self.config.NUMBER_OF_ROUNDS
+        bot1.total_rounds = bot2.total_rounds = total_rounds
         
+        cooperation_points, betrayal_points, betrayed_points, defection_points = payoffs(self.config)
         scores = {bot1.name: 0, bot2.name: 0}
         stats = {
             'mutual_cooperation': 0,
@@ -171,90 +418,214 @@ class TournamentSimulation:
             'betrayals': {bot1.name: 0, bot2.name: 0}
         }
         
-        # Reset bot histories at start of match
-        bot1.my_history = []
-        bot1.opponent_history = []
-        bot2.my_history = []
-        bot2.opponent_history = []
+        # Both bots read their histories from one shared buffer for this match
+        history = MatchHistory()
+        decide1, observe1 = bind_bot(bot1, history, 0)
+        decide2, observe2 = bind_bot(bot2, history, 1)
+        if self.time_decisions:
+            timings = {bot1.name: DecisionTiming(), bot2.name: DecisionTiming()}
+            decide1 = timings[bot1.name].timed(decide1)
+            decide2 = timings[bot2.name].timed(decide2)
+        
+        # Bots with a fixed move schedule just replay it instead of deciding every round
+        schedule1 = self._move_schedule(bot1, rounds)
+        schedule2 = self._move_schedule(bot2, rounds)
+        if schedule1 is not None:
+            decide1 = iter(schedule1).__next__
+        if schedule2 is not None:
+            decide2 = iter(schedule2).__next__
         
-        # Prepare output lines for detailed match history
-        output_lines = [
-            "="*50,
-            f"MATCH RESULTS - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-            f"Bot 1: {bot1.name}",
-            f"Bot 2: {bot2.name}",
-            "="*50,
-            "",
-            "ROUND HISTORY:",
-            f"{'Round':^6} | {'Bot 1':^10} | {'Bot 2':^10} | {'Round Result':^12} | {'Current Score':^12}",
-            "-"*60
-        ]
+        # Rounds after which each pair of bot states was first seen, if both bots report their state
+        seen_states = {} if provides_state_key(bot1) and provides_state_key(bot2) else None
         
         # Play rounds
         for round_num in range(rounds):
             # Get both moves before updating histories
-            move1 = bot1.make_decision()
-            move2 = bot2.make_decision()
+            move1 = decide1()
+            move2 = decide2()
             
             # Update histories for both bots after both moves are known
-            bot1.opponent_history.append(move2)
-            bot1.my_history.append(move1)
-            bot2.opponent_history.append(move1)
-            bot2.my_history.append(move2)
+            history.append(move1, move2)
+            observe1(move1, move2)
+            observe2(move2, move1)
             
             # Calculate round result and update scores
             if move1 == Move.COOPERATE and move2 == Move.COOPERATE:
-                round_result = f"{GameConfig.MUTUAL_COOPERATION_POINTS:^2} - {GameConfig.MUTUAL_COOPERATION_POINTS:^2}"
-                scores[bot1.name] += GameConfig.MUTUAL_COOPERATION_POINTS
-                scores[bot2.name] += GameConfig.MUTUAL_COOPERATION_POINTS
+                scores[bot1.name] += cooperation_points
+                scores[bot2.name] += cooperation_points
                 stats['mutual_cooperation'] += 1
             elif move1 == Move.COOPERATE and move2 == Move.DEFECT:
-                round_result = f"{GameConfig.BETRAYED_POINTS:^2} - {GameConfig.BETRAYAL_POINTS:^2}"
-                scores[bot1.name] += GameConfig.BETRAYED_POINTS
-                scores[bot2.name] += GameConfig.BETRAYAL_POINTS
+                scores[bot1.name] += betrayed_points
+                scores[bot2.name] += betrayal_points
                 stats['betrayals'][bot2.name] += 1
             elif move1 == Move.DEFECT and move2 == Move.COOPERATE:
-                round_result = f"{GameConfig.BETRAYAL_POINTS:^2} - {GameConfig.BETRAYED_POINTS:^2}"
-                scores[bot1.name] += GameConfig.BETRAYAL_POINTS
-                scores[bot2.name] += GameConfig.BETRAYED_POINTS
+                scores[bot1.name] += betrayal_points
+                scores[bot2.name] += betrayed_points
                 stats['betrayals'][bot1.name] += 1
             else:  # Both defect
-                round_result = f"{GameConfig.MUTUAL_DEFECTION_POINTS:^2} - {GameConfig.MUTUAL_DEFECTION_POINTS:^2}"
-                scores[bot1.name] += GameConfig.MUTUAL_DEFECTION_POINTS
-                scores[bot2.name] += GameConfig.MUTUAL_DEFECTION_POINTS
+                scores[bot1.name] += defection_points
+                scores[bot2.name] += defection_points
                 stats['mutual_defection'] += 1
-                
-            current_score = f"{scores[bot1.name]:^5} - {scores[bot2.name]:^5}"
-            output_lines.append(f"{round_num+1:^6} | {move1.name:^10} | {move2.name:^10} | {round_result:^12} | {current_score}")
-        
-        # Add final statistics
-        output_lines.extend([
-            "\nMATCH STATISTICS:",
-            "-"*50,
-            f"Total Rounds: {rounds}",
-            f"Mutual Cooperation: {stats['mutual_cooperation']} ({stats['mutual_cooperation']/rounds*100:.1f}%)",
-            f"Mutual Defection: {stats['mutual_defection']} ({stats['mutual_defection']/rounds*100:.1f}%)",
-            f"Betrayals by {bot1.name}: {stats['betrayals'][bot1.name]} ({stats['betrayals'][bot1.name]/rounds*100:.1f}%)",
-            f"Betrayals by {bot2.name}: {stats['betrayals'][bot2.name]} ({stats['betrayals'][bot2.name]/rounds*100:.1f}%)",
-            "",
-            "FINAL SCORES:",
-            "-"*50,
-            f"{bot1.name}: {scores[bot1.name]}",
-            f"{bot2.name}: {scores[bot2.name]}",
-            "="*50
-        ])
-        
-        # Write match results to file
-        match_file = os.path.join(tournament_dir, f"{bot1.name}_vs_{bot2.name}.txt")
-        with open(match_file, 'w') as f:
-            f.write('\n'.join(output_lines))
+            
+            # Once both bots are back in an earlier state, the rounds since then repeat until the end
+            if seen_states is not None:
+                state = (bot1.state_key(), bot2.state_key())
+                if state[0] is not None and state[1] is not None:
+                    if state in seen_states:
+                        counts = history.repeat_cycle(seen_states[state], rounds)
+                        self._add_counts(scores, stats, bot1.name, bot2.name, counts)
+                        break
+                    seen_states[state] = round_num + 1
         
-        return {
+        match_stats = {
             'scores': scores,
             'mutual_cooperation': stats['mutual_cooperation'],
             'mutual_defection': stats['mutual_defection'],
             'betrayals': stats['betrayals']
         }
+        if self.time_decisions:
+            match_stats['timing'] = timings
+        timeouts = {bot.name: bot.timeouts for bot in (bot1, bot2) if isinstance(bot, SandboxedBot) and bot.timeouts}
+        if timeouts:
+            match_stats['timeouts'] = timeouts
+        return self._log_match(bot1.name, bot2.name, history.view(0), history.view(1), match_stats, tournament_dir)
+
+    def _add_counts(self, scores, stats, bot1_name, bot2_name, counts):
+        """Add (mutual cooperation, mutual defection, betrayals1, betrayals2) to running match totals."""
+        cycle_stats = self._count_stats(bot1_name, bot2_name, counts)
+        scores[bot1_name] += cycle_stats['scores'][bot1_name]
+        scores[bot2_name] += cycle_stats['scores'][bot2_name]
+        stats['mutual_cooperation'] += cycle_stats['mutual_cooperation']
+        stats['mutual_defection'] += cycle_stats['mutual_defection']
+        stats['betrayals'][bot1_name] += cycle_stats['betrayals'][bot1_name]
+        stats['betrayals'][bot2_name] += cycle_stats['betrayals'][bot2_name]
+
+    def _run_table_matches(self, pairings, results, tournament_dir):
+        """Play every pairing between table-driven bots with the vectorized engine.
+        
+        Fills in results for the pairings it plays and leaves the others untouched.
+        """
+        tables = {}
+        indices, tables1, tables2, rounds = [], [], [], []
+        for k, (bot1, bot2, bot1_path, bot2_path, match_rounds) in enumerate(pairings):
+            if results[k] is not None:
+                continue
+            for bot, bot_path in [(bot1, bot1_path), (bot2, bot2_path)]:
+                if (bot_path, match_rounds) not in tables:
+                    tables[(bot_path, match_rounds)] = get_strategy_table(bot, match_rounds)
+            table1 = tables[(bot1_path, match_rounds)]
+            table2 = tables[(bot2_path, match_rounds)]
+            if table1 is not None and table2 is not None:
+                indices.append(k)
+                tables1.append(table1)
+                tables2.append(table2)
+                rounds.append(match_rounds)
+        if not indices:
+            return
+
+        for k, (moves1, moves2, counts) in zip(indices, play_table_matches(tables1, tables2, rounds)):
+            bot1, bot2 = pairings[k][0], pairings[k][1]
+            match_stats = self._count_stats(bot1.name, bot2.name, counts)
+            results[k] = self._log_match(bot1.name, bot2.name, moves1, moves2, match_stats, tournament_dir)
+
+    def _move_schedule(self, bot, rounds):
+        """Return the bot's move schedule, computed once per bot class and match length."""
+        key = (type(bot), bot.total_rounds, rounds)
+        if key not in self._move_schedules:
+            self._move_schedules[key] = get_move_schedule(bot, rounds)
+        return self._move_schedules[key]
+
+    def _reuse_previous_matches(self, previous, pairings, digests, rounds, results, tournament_dir):
+        """Fill in results for pairings already played in a previous tournament and return how many.
+        
+        Only matches played with the same settings and seed are reused.
+        """
+        matches = load_tournament_results(previous, rounds, self.config, self.seed)
+        reused = 0
+        for k, (bot1, bot2, bot1_path, bot2_path, match_rounds) in enumerate(pairings):
+            digest1, digest2 = digests[bot1_path], digests[bot2_path]
+            if (digest1, digest2) in matches:
+                stored_rounds, match_stats, record = matches[(digest1, digest2)]
+                moves1, moves2 = MatchRecord(record).moves()
+            elif (digest2, digest1) in matches:
+                stored_rounds, match_stats, record = matches[(digest2, digest1)]
+                moves2, moves1 = MatchRecord(record).moves()
+            else:
+                continue
+
+            # The reused match keeps its original length, which the unplayed rounds check leaves out
+            pairings[k] = (bot1, bot2, bot1_path, bot2_path, stored_rounds)
+            results[k] = self._log_match(bot1.name, bot2.name, moves1, moves2, match_stats, tournament_dir)
+            reused += 1
+        return reused
+
+    def _run_schedule_matches(self, pairings, results, tournament_dir):
+        """Score every pairing between two bots with fixed move schedules.
+        
+        Fills in results for the pairings it scores; pairings that already have results
+        (from the cache or a previous tournament) are skipped.
+        """
+        packed = {}
+        for k, (bot1, bot2, _, _, match_rounds) in enumerate(pairings):
+            if results[k] is not None:
+                continue
+            schedule1 = self._move_schedule(bot1, match_rounds)
+            schedule2 = self._move_schedule(bot2, match_rounds)
+            if schedule1 is None or schedule2 is None:
+                continue
+
+            for bot, schedule in [(bot1, schedule1), (bot2, schedule2)]:
+                if (type(bot), match_rounds) not in packed:
+                    packed[(type(bot), match_rounds)] = pack_schedule(schedule)
+            counts = schedule_outcome_counts(packed[(type(bot1), match_rounds)],
+                                             packed[(type(bot2), match_rounds)], match_rounds)
+            match_stats = self._count_stats(bot1.name, bot2.name, counts)
+            results[k] = self._log_match(bot1.name, bot2.name, schedule1, schedule2, match_stats, tournament_dir)
+
+    def _count_stats(self, bot1_name, bot2_name, counts):
+        """Build match statistics from (mutual cooperation, mutual defection, betrayals1, betrayals2)."""
+        mutual_cooperation, mutual_defection, betrayals1, betrayals2 = counts
+        cooperation_points, betrayal_points, betrayed_points, defection_points = payoffs(self.config)
+        return {
+            'scores': {
+                bot1_name: (mutual_cooperation * cooperation_points
+                            + mutual_defection * defection_points
+                            + betrayals1 * betrayal_points
+                            + betrayals2 * betrayed_points),
+                bot2_name: (mutual_cooperation * cooperation_points
+                            + mutual_defection * defection_points
+                            + betrayals2 * betrayal_points
+                            + betrayals1 * betrayed_points)
+            },
+            'mutual_cooperation': mutual_cooperation,
+            'mutual_defection': mutual_defection,
+            'betrayals': {bot1_name: betrayals1, bot2_name: betrayals2}
+        }
+
+    def _log_match(self, bot1_name, bot2_name, moves1, moves2, match_stats, tournament_dir):
+        """Write the match log in the configured format and return the match statistics.
+        
+        The packed match record is always added to the statistics as 'record', so the
+        match can be archived (lazy mode) or cached.
+        """
+        match_stats['record'] = encode_match_record(bot1_name, bot2_name, moves1, moves2, payoffs(self.config))
+        
+        # Write match results to file; in lazy mode only the packed moves are kept
+        if self.log_format == 'text':
+            match_file = os.path.join(tournament_dir, f"{bot1_name}_vs_{bot2_name}.txt")
+            with open(match_file, 'w') as f:
+                f.write(render_match_log(bot1_name, bot2_name, moves1, moves2, payoffs(self.config)))
+        elif self.log_format == 'binary':
+            match_file = os.path.join(tournament_dir, f"{bot1_name}_vs_{bot2_name}{RECORD_EXTENSION}")
+            with open(match_file, 'wb') as f:
+                f.write(match_stats['record'])
+        
+        return match_stats
+
+    def render_match(self, bot1_name, bot2_name):
+        """Render the text log of a match from the last lazy-mode tournament."""
+        record = self.match_records.get((bot1_name, bot2_name)) or self.match_records[(bot2_name, bot1_name)]
+        return render_match_record(MatchRecord(record))
 
     def _write_tournament_summary(self, directory, scores, stats, matches_played, rounds_per_match, bot_names, display_names, score_matrix):
         def clean_name(name):
@@ -285,29 +656,6 @@ class TournamentSimulation:
             vs_width = max(len(f"vs {name}") for name in display_names.values())  # Width including "vs "
             score_width = max(vs_width, 5)  # Width for score columns
             
-            # Create and fill score matrix
-            score_matrix = {bot1: {bot2: 0 for bot2 in bot_names} for bot1 in bot_names}
-            
-            # Fill in score matrix from match results
-            for bot1 in bot_names:
-                for bot2 in bot_names:
-                    if bot1 != bot2:
-                        match_file = os.path.join(directory, f"{bot1}_vs_{bot2}.txt")
-                        if os.path.exists(match_file):
-                            with open(match_file, 'r') as mf:
-                                for line in mf:
-                                    if line.startswith(f"{bot1}: "):
-                                        score = int(line.split(": ")[1])
-                                        score_matrix[bot1][bot2] = score
-                        else:
-                            match_file = os.path.join(directory, f"{bot2}_vs_{bot1}.txt")
-                            if os.path.exists(match_file):
-                                with open(match_file, 'r') as mf:
-                                    for line in mf:
-                                        if line.startswith(f"{bot1}: "):
-                                            score = int(line.split(": ")[1])
-                                            score_matrix[bot1][bot2] = score
-
             # Write score matrix
             f.write("SCORE MATRIX\n")
             f.write("-"*50 + "\n\n")
@@ -351,9 +699,6 @@ class TournamentSimulation:
             f.write(f"Average Mutual Cooperation: {stats['mutual_cooperation']/total_matches:.1f} per match\n")
             f.write(f"Average Mutual Defection: {stats['mutual_defection']/total_matches:.1f} per match\n")
             f.write(f"Average Bot Betrayals: {sum(stats['betrayals'].values())/total_matches:.1f} per match\n")
-        
-        # After writing the tournament summary, export the CSV
-        self._export_score_matrix_csv(directory, bot_names, display_names, score_matrix)
 
     def _export_score_matrix_csv(self, directory, bot_names, display_names, score_matrix):
         """Export the score matrix as a CSV file."""
@@ -381,4 +726,41 @@ class TournamentSimulation:
                 avg_score = total_score / matches if matches > 0 else 0
                 row.append(f"{avg_score:.1f}")
                 
-                f.write(",".join(row) + "\n")
\ No newline at end of file
+                f.write(",".join(row) + "\n")
+
+
+# Simulation instance owned by each worker process of a parallel tournament
+_worker_simulation = None
+
+
+def _init_worker(log_format, config=None, time_decisions=False, sandbox_settings=None):
+    global _worker_simulation
+    # Every worker process has a sandbox of its own; its workers stop when this process exits
+    sandbox = BotSandbox(*sandbox_settings) if sandbox_settings is not None else None
+    _worker_simulation = TournamentSimulation(log_format, config, time_decisions, sandbox)
+
+
+def _play_pairing(job):
+    """Play one scheduled pairing inside a worker process."""
+    bot1_path, bot2_path, match_rounds, tournament_dir, match_seed = job
+    bot1 = _worker_simulation.load_bot(bot1_path)
+    bot2 = _worker_simulation.load_bot(bot2_path)
+    return _worker_simulation._run_match(bot1, bot2, match_rounds, tournament_dir, match_seed)
+
+
+def _play_pairings(jobs):
+    """Play a chunk of scheduled pairings inside a worker process."""
+    return [_play_pairing(job) for job in jobs]
+
+
+def _play_match_record(job):
+    """Play one match inside a worker process and return its packed record.
+
+    job is (bot1_path, bot2_path, match_rounds, total_rounds, match_seed), where
+    total_rounds is the match length the bots are told.
+    """
+    bot1_path, bot2_path, match_rounds, total_rounds, match_seed = job
+    bot1 = _worker_simulation.load_bot(bot1_path)
+    bot2 = _worker_simulation.load_bot(bot2_path)
+    match_stats = _worker_simulation._run_match(bot1, bot2, match_rounds, None, match_seed, total_rounds=total_rounds)
+    return match_stats['record']
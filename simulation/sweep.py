@@ -0,0 +1,138 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from utils.game_config import GameConfig, payoffs
+from simulation.match_cache import match_key
+from simulation.match_record import MatchRecord
+from simulation.simulate_tournament import TournamentSimulation, new_run_dir, _init_worker, _play_match_record
+from simulation.vectorized import score_outcome_counts
+
+# Settings that change the moves bots play; payoffs are never shown to the bots
+MOVE_SETTINGS = ('NUMBER_OF_ROUNDS', 'ADD_NOISE')
+
+
+def expand_grid(grid):
+    """Return one {setting: value} dict for every combination of the values in grid.
+
+    grid maps GameConfig setting names to lists of values, e.g.
+    {'BETRAYAL_POINTS': [5, 6], 'NUMBER_OF_ROUNDS': [100, 200]}.
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in product(*(grid[name] for name in names))]
+
+
+class ParameterSweep:
+    """Play the same round-robin tournament under every combination of GameConfig settings.
+
+    Each combination is a GameConfig instance, so nothing global is changed. The moves of
+    a match only depend on its length, the total_rounds the bots are told and its random
+    stream, so all settings that share NUMBER_OF_ROUNDS and ADD_NOISE share their matches:
+    every match is played once and then scored for all payoff settings together (see
+    vectorized.score_outcome_counts). Match random streams depend on the seed and the
+    pairing only, so with the default payoffs a setting plays exactly like a tournament
+    run with the same seed.
+    """
+    def __init__(self, bot_paths, grid, seed=0, workers=1):
+        self.bot_paths = list(bot_paths)
+        self.settings = expand_grid(grid)
+        self.configs = [GameConfig(**settings) for settings in self.settings]
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.simulation = TournamentSimulation(log_format='lazy')
+        self.matches_played = 0
+        self.averages = []  # {bot name: average score per match} for every config
+
+    def run(self):
+        """Play the sweep and return the directory with the results of every config."""
+        # Configs with the same move settings share one schedule of pairings and their matches
+        groups = {}
+        for index, config in enumerate(self.configs):
+            groups.setdefault(tuple(getattr(config, name) for name in MOVE_SETTINGS), []).append(index)
+
+        schedules = {}
+        jobs = {}
+        for move_settings, indices in groups.items():
+            move_config = GameConfig(**dict(zip(MOVE_SETTINGS, move_settings)))
+            simulation = TournamentSimulation(log_format='lazy', config=move_config)
+            pairings, _ = simulation._schedule_pairings(self.bot_paths, move_config.NUMBER_OF_ROUNDS,
+                                                        random.Random(self.seed))
+            match_seeds = [match_key(bot1_path, bot2_path, match_rounds, self.seed, move_config)
+                           for _, _, bot1_path, bot2_path, match_rounds in pairings]
+            for (_, _, bot1_path, bot2_path, match_rounds), match_seed in zip(pairings, match_seeds):
+                jobs[match_seed] = (bot1_path, bot2_path, match_rounds, move_config.NUMBER_OF_ROUNDS, match_seed)
+            schedules[move_settings] = (pairings, match_seeds)
+
+        job_list = list(jobs.values())
+        if self.workers > 1 and len(job_list) > 1:
+            chunksize = max(1, len(job_list) // (self.workers * 4))
+            # Matches are only scored, so they are played without logs or timing
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=('lazy', None, False)) as executor:
+                records = list(executor.map(_play_match_record, job_list, chunksize=chunksize))
+        else:
+            _init_worker('lazy', None, False)
+            records = [_play_match_record(job) for job in job_list]
+        self.matches_played = len(job_list)
+        counts = {job[-1]: MatchRecord(record).outcome_counts() for job, record in zip(job_list, records)}
+
+        directory = new_run_dir(self.simulation.logs_dir, "sweep")
+        self.averages = [None] * len(self.configs)
+        for move_settings, indices in groups.items():
+            pairings, match_seeds = schedules[move_settings]
+            match_counts = [counts[match_seed] for match_seed in match_seeds]
+            scores = score_outcome_counts(match_counts, [payoffs(self.configs[index]) for index in indices])
+            for index, config_scores in zip(indices, scores):
+                self.averages[index] = self._write_config_results(
+                    os.path.join(directory, f"config_{index + 1:03d}"), self.configs[index],
+                    pairings, match_counts, config_scores)
+
+        self._write_sweep_summary(directory)
+        return directory
+
+    def _write_config_results(self, config_dir, config, pairings, match_counts, config_scores):
+        """Write the tournament summary and results.csv of one config and return its average scores."""
+        os.makedirs(config_dir, exist_ok=True)
+        results = []
+        totals, matches = {}, {}
+        for (bot1, bot2, _, _, _), counts, (score1, score2) in zip(pairings, match_counts, config_scores):
+            mutual_cooperation, mutual_defection, betrayals1, betrayals2 = counts
+            results.append({
+                'scores': {bot1.name: score1, bot2.name: score2},
+                'mutual_cooperation': mutual_cooperation,
+                'mutual_defection': mutual_defection,
+                'betrayals': {bot1.name: betrayals1, bot2.name: betrayals2}
+            })
+            for name, score in [(bot1.name, score1), (bot2.name, score2)]:
+                totals[name] = totals.get(name, 0) + score
+                matches[name] = matches.get(name, 0) + 1
+
+        simulation = TournamentSimulation(log_format='lazy', config=config)
+        simulation._write_results(config_dir, pairings, results, config.NUMBER_OF_ROUNDS)
+        return {name: totals[name] / matches[name] for name in totals}
+
+    def _write_sweep_summary(self, directory):
+        setting_names = list(self.settings[0]) if self.settings else []
+        bot_names = sorted({name for averages in self.averages for name in averages})
+        separate_matches = len(self.configs) * len(self.bot_paths) * (len(self.bot_paths) - 1) // 2
+
+        with open(os.path.join(directory, "sweep_summary.txt"), 'w') as f:
+            f.write("="*50 + "\n")
+            f.write("PARAMETER SWEEP SUMMARY\n")
+            f.write("="*50 + "\n\n")
+            f.write(f"Configurations: {len(self.configs)}\n")
+            f.write(f"Matches Played: {self.matches_played} (separate tournaments: {separate_matches})\n\n")
+
+            f.write("WINNERS\n")
+            f.write("-"*50 + "\n")
+            for index, (settings, averages) in enumerate(zip(self.settings, self.averages), 1):
+                winner = max(averages, key=averages.get)
+                described = ", ".join(f"{name}={value}" for name, value in settings.items()) or "defaults"
+                f.write(f"config_{index:03d} | {described} | {winner} ({averages[winner]:.1f})\n")
+
+        with open(os.path.join(directory, "sweep_results.csv"), 'w') as f:
+            f.write(",".join(["Config"] + setting_names + bot_names) + "\n")
+            for index, (settings, averages) in enumerate(zip(self.settings, self.averages), 1):
+                row = [f"config_{index:03d}"] + [str(settings[name]) for name in setting_names]
+                row += [f"{averages[name]:.1f}" for name in bot_names]
+                f.write(",".join(row) + "\n")
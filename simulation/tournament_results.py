@@ -0,0 +1,70 @@
+import json
+import os
+from utils.game_config import GameConfig, payoffs
+from simulation.match_cache import encode_match_entry, decode_match_entry
+
+# Machine-readable results written next to tournament_summary.txt, used by incremental tournaments
+RESULTS_FILENAME = "tournament_results.json"
+RESULTS_VERSION = 1
+
+
+def _settings(rounds, config):
+    # Stored matches can only be reused by a tournament played with the same settings
+    return {
+        'rounds': rounds,
+        'total_rounds': config.NUMBER_OF_ROUNDS,
+        'add_noise': config.ADD_NOISE,
+        'payoffs': list(payoffs(config))
+    }
+
+
+def write_tournament_results(directory, rounds, seed, config, matches):
+    """Write the results of every match of a tournament and the seed it was played with.
+
+    matches holds (bot1 digest, bot2 digest, match rounds, match_stats) tuples, where
+    match_stats includes the packed match record. config is the GameConfig (or the
+    class itself) the tournament was played with.
+    """
+    results = {
+        'version': RESULTS_VERSION,
+        'settings': _settings(rounds, config),
+        'seed': seed,
+        'matches': [dict(encode_match_entry(match_stats, match_stats['record']),
+                         bots=[digest1, digest2], rounds=match_rounds)
+                    for digest1, digest2, match_rounds, match_stats in matches]
+    }
+    with open(os.path.join(directory, RESULTS_FILENAME), 'w') as f:
+        json.dump(results, f)
+
+
+def _read_results(directory):
+    with open(os.path.join(directory, RESULTS_FILENAME), 'r') as f:
+        results = json.load(f)
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError(f"Unsupported tournament results version {results.get('version')}")
+    return results
+
+
+def load_tournament_seed(directory):
+    """Return the seed an earlier tournament was played with."""
+    return _read_results(directory)['seed']
+
+
+def load_tournament_results(directory, rounds, config=GameConfig, seed=None):
+    """Return the stored matches of an earlier tournament that can be reused.
+
+    The result maps (bot1 digest, bot2 digest) to (match rounds, match_stats, record).
+    It is empty if the tournament was played with different settings, or with another
+    seed than the given one, since its matches then came from other random streams.
+    """
+    results = _read_results(directory)
+    if results['settings'] != _settings(rounds, config):
+        return {}
+    if seed is not None and results['seed'] != seed:
+        return {}
+
+    matches = {}
+    for entry in results['matches']:
+        match_stats, record = decode_match_entry(entry)
+        matches[tuple(entry['bots'])] = (entry['rounds'], match_stats, record)
+    return matches
@@ -0,0 +1,120 @@
+from utils.moves import Move
+from simulation.match_record import pack_moves
+
+# NumPy is optional; without it every pairing is played by the regular engine
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_MOVES = (Move.COOPERATE, Move.DEFECT)
+
+
+def vectorized_available() -> bool:
+    return np is not None
+
+
+def play_table_matches(tables1, tables2, rounds):
+    """Play many matches between table-driven strategies at once.
+
+    tables1[i] and tables2[i] are the StrategyTables of both bots in pairing i and
+    rounds[i] is its length. All pairings advance together, one array step per round.
+    Returns one (moves1, moves2, counts) tuple per pairing, where moves are Move lists
+    and counts is (mutual cooperation, mutual defection, betrayals by bot 1, betrayals
+    by bot 2).
+    """
+    # Stack every distinct table into shared move and transition arrays,
+    # padding states so all tables have the same width
+    distinct = {}
+    for table in list(tables1) + list(tables2):
+        distinct.setdefault(id(table), table)
+    table_list = list(distinct.values())
+    table_index = {key: i for i, key in enumerate(distinct)}
+    max_states = max(len(table.moves) for table in table_list)
+
+    moves_table = np.zeros((len(table_list), max_states), dtype=np.int8)
+    next_state = np.zeros((len(table_list), max_states, 2), dtype=np.int32)
+    for t, table in enumerate(table_list):
+        for state, move in enumerate(table.moves):
+            moves_table[t, state] = move == Move.DEFECT
+            next_state[t, state, 0] = table.transitions[state][Move.COOPERATE]
+            next_state[t, state, 1] = table.transitions[state][Move.DEFECT]
+
+    index1 = np.array([table_index[id(table)] for table in tables1], dtype=np.int32)
+    index2 = np.array([table_index[id(table)] for table in tables2], dtype=np.int32)
+    state1 = np.array([table.initial_state for table in tables1], dtype=np.int32)
+    state2 = np.array([table.initial_state for table in tables2], dtype=np.int32)
+
+    max_rounds = max(rounds)
+    moves1 = np.zeros((len(tables1), max_rounds), dtype=np.int8)
+    moves2 = np.zeros((len(tables1), max_rounds), dtype=np.int8)
+    for round_num in range(max_rounds):
+        move1 = moves_table[index1, state1]
+        move2 = moves_table[index2, state2]
+        moves1[:, round_num] = move1
+        moves2[:, round_num] = move2
+        state1 = next_state[index1, state1, move2]
+        state2 = next_state[index2, state2, move1]
+
+    # Count round outcomes for all pairings at once, ignoring rounds past each match's end
+    played = np.arange(max_rounds) < np.array(rounds)[:, None]
+    defects1 = (moves1 == 1) & played
+    defects2 = (moves2 == 1) & played
+    cooperates1 = (moves1 == 0) & played
+    cooperates2 = (moves2 == 0) & played
+    counts = np.stack([(cooperates1 & cooperates2).sum(axis=1),
+                       (defects1 & defects2).sum(axis=1),
+                       (defects1 & cooperates2).sum(axis=1),
+                       (cooperates1 & defects2).sum(axis=1)], axis=1).tolist()
+
+    return [([_MOVES[value] for value in moves1[i, :match_rounds].tolist()],
+             [_MOVES[value] for value in moves2[i, :match_rounds].tolist()],
+             tuple(counts[i]))
+            for i, match_rounds in enumerate(rounds)]
+
+
+def pack_schedule(schedule) -> int:
+    """Pack a move schedule into an int whose bit i is set when round i + 1 is a DEFECT."""
+    return int.from_bytes(pack_moves(schedule), 'little')
+
+
+def schedule_outcome_counts(defects1: int, defects2: int, rounds: int):
+    """Count round outcomes of two packed move schedules with bitwise operations.
+
+    Works without NumPy. Returns (mutual cooperation, mutual defection, betrayals by
+    bot 1, betrayals by bot 2) over the first `rounds` rounds.
+    """
+    mask = (1 << rounds) - 1
+    defects1 &= mask
+    defects2 &= mask
+    cooperates1 = ~defects1 & mask
+    cooperates2 = ~defects2 & mask
+    return (bin(cooperates1 & cooperates2).count('1'),
+            bin(defects1 & defects2).count('1'),
+            bin(defects1 & cooperates2).count('1'),
+            bin(cooperates1 & defects2).count('1'))
+
+
+def score_outcome_counts(counts, payoff_points):
+    """Score the same matches under several payoff settings at once.
+
+    counts holds one (mutual cooperation, mutual defection, betrayals by bot 1, betrayals
+    by bot 2) tuple per match and payoff_points one (mutual cooperation, betrayal,
+    betrayed, mutual defection) tuple per setting. Returns scores[p][m], the (bot 1,
+    bot 2) scores of match m under setting p, from a single matrix product when NumPy
+    is installed and from plain loops otherwise.
+    """
+    if np is None:
+        return [[(cooperation * points[0] + defection * points[3] + betrayals1 * points[1] + betrayals2 * points[2],
+                  cooperation * points[0] + defection * points[3] + betrayals2 * points[1] + betrayals1 * points[2])
+                 for cooperation, defection, betrayals1, betrayals2 in counts]
+                for points in payoff_points]
+
+    outcomes = np.array(counts, dtype=np.int64).reshape(-1, 4)
+    points = np.array(payoff_points).reshape(-1, 4)
+    # Points per outcome count for bot 1 and bot 2, in the order of counts
+    weights1 = points[:, [0, 3, 1, 2]]
+    weights2 = points[:, [0, 3, 2, 1]]
+    scores1 = (weights1 @ outcomes.T).tolist()
+    scores2 = (weights2 @ outcomes.T).tolist()
+    return [list(zip(row1, row2)) for row1, row2 in zip(scores1, scores2)]
@@ -1,13 +1,20 @@
 from abc import ABC, abstractmethod
 from utils.moves import Move
 from utils.game_config import GameConfig
+from utils.history_stats import HistoryStats
 from typing import List
+import random
 
 class AbstractBot(ABC):
+    # Number of most recent moves kept in history_stats windows
+    HISTORY_WINDOW = 3
+    
     def __init__(self):
         self.my_history = []
         self.opponent_history = []
+        self._history_stats = None
         self.total_rounds = GameConfig.NUMBER_OF_ROUNDS
+        self._random = None
     
     @property
     @abstractmethod
@@ -22,6 +29,65 @@ class AbstractBot(ABC):
     def strategy(self, my_history: List[Move], opponent_history: List[Move], current_round: int, total_rounds: int) -> Move:
         pass
     
+    def strategy_table(self, rounds: int):
+        """Optionally describe the strategy as a StrategyTable for a match of `rounds` rounds.
+        
+        Bots whose moves depend only on a small state and the opponent's last move (or only
+        on the round number) can return one so the vectorized engine can play them.
+        """
+        return None
+    
+    def move_schedule(self, rounds: int):
+        """Optionally return the list of moves for every round of a match of `rounds` rounds.
+        
+        Only for bots that never look at the opponent; the simulator then computes the
+        schedule once instead of calling strategy() every round.
+        """
+        return None
+    
+    def memory_one(self):
+        """Optionally describe the strategy as a MemoryOne vector of cooperation probabilities.
+        
+        Only for bots whose next move depends on nothing but the previous round. Pairs of
+        such bots can be scored exactly from their vectors instead of being played.
+        """
+        return None
+    
+    def state_key(self):
+        """Optionally return a hashable snapshot of everything the strategy depends on.
+        
+        Only for deterministic bots: two rounds with equal keys must be followed by the
+        same moves whenever the opponent plays the same. When both bots in a match
+        provide keys, the simulator stops playing once the pair of keys repeats and
+        completes the match by repeating the cycle. Returning None skips a round.
+        """
+        return None
+    
+    @property
+    def history_stats(self) -> HistoryStats:
+        """Running statistics over the rounds played so far (see HistoryStats).
+
+        They are only kept for bots that read them: the first access creates them and
+        every access catches up with the rounds played since the previous one.
+        """
+        if self._history_stats is None:
+            self._history_stats = HistoryStats(self.HISTORY_WINDOW)
+        stats = self._history_stats
+        for i in range(stats.rounds_played, len(self.my_history)):
+            stats.update(self.my_history[i], self.opponent_history[i])
+        return stats
+    
+    @property
+    def random(self) -> random.Random:
+        """The bot's own random number generator.
+        
+        It is created from the global random module, which the simulator seeds for
+        every match, so a seeded tournament plays the same on every run.
+        """
+        if self._random is None:
+            self._random = random.Random(random.getrandbits(64))
+        return self._random
+    
     @property
     def cooperate(self) -> Move:
         return Move.COOPERATE
@@ -0,0 +1,40 @@
+import importlib.util
+import inspect
+import os
+from utils.abstract_bot import AbstractBot
+
+# Bot classes resolved so far, keyed by absolute path.
+# Each entry stores the file's (mtime, size) so edited files are reloaded.
+_bot_classes = {}
+
+
+def load_bot_class(bot_path):
+    """Return the AbstractBot subclass defined in a bot file.
+
+    The file is executed only the first time it is requested (or after it changes
+    on disk); later calls return the cached class.
+    """
+    path = os.path.abspath(bot_path)
+    stat = os.stat(path)
+    file_key = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _bot_classes.get(path)
+    if cached is not None and cached[0] == file_key:
+        return cached[1]
+
+    spec = importlib.util.spec_from_file_location("bot_module", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    # Abstract bases such as EventBot may be imported by the bot file, skip them
+    for item in dir(module):
+        obj = getattr(module, item)
+        if isinstance(obj, type) and issubclass(obj, AbstractBot) and not inspect.isabstract(obj):
+            _bot_classes[path] = (file_key, obj)
+            return obj
+    raise ValueError("No valid bot class found in file")
+
+
+def load_bot(bot_path):
+    """Create a fresh instance of the bot defined in a bot file."""
+    return load_bot_class(bot_path)()
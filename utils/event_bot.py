@@ -0,0 +1,42 @@
+from abc import abstractmethod
+from utils.abstract_bot import AbstractBot
+from utils.moves import Move
+from typing import List
+
+class EventBot(AbstractBot):
+    """Base class for event-driven bots.
+
+    Instead of receiving the full histories every round, the bot is asked for its
+    next move with decide() and told the outcome of each round with observe(), so it
+    can keep whatever O(1) state it needs.
+    """
+    @abstractmethod
+    def decide(self) -> Move:
+        pass
+    
+    def observe(self, my_move: Move, opponent_move: Move):
+        """Called after every round with both moves"""
+        pass
+    
+    def strategy(self, my_history: List[Move], opponent_history: List[Move], current_round: int, total_rounds: int) -> Move:
+        return self.decide()
+    
+    def update_history(self, my_move: Move, opponent_move: Move):
+        self.observe(my_move, opponent_move)
+
+
+def bind_bot(bot: AbstractBot, history, player: int):
+    """Return the (decide, observe) callables the engine uses to drive a bot.
+
+    Event-driven bots are called directly. strategy()-based bots are adapted: they read
+    views over the shared match history, which already holds every round, so there is
+    nothing to observe (their history_stats catch up from the views when read).
+    """
+    if isinstance(bot, EventBot):
+        return bot.decide, bot.observe
+    bot.my_history, bot.opponent_history = history.view(player), history.view(1 - player)
+    return bot.make_decision, _ignore_round
+
+
+def _ignore_round(my_move: Move, opponent_move: Move):
+    pass
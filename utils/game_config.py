@@ -15,4 +15,20 @@ class GameConfig:
     NUMBER_OF_ROUNDS = 200
 
     # Whether to add noise to number of rounds
-    ADD_NOISE = False
\ No newline at end of file
+    ADD_NOISE = False
+
+    def __init__(self, **settings):
+        # A configuration for a single run; settings that are not given keep the defaults above
+        for name, value in settings.items():
+            if not name.isupper() or not hasattr(GameConfig, name):
+                raise ValueError(f"Unknown game setting: {name}")
+            setattr(self, name, value)
+
+
+def payoffs(config=GameConfig):
+    """Return (mutual cooperation, betrayal, betrayed, mutual defection) points of a config.
+
+    config may be GameConfig itself or an instance of it.
+    """
+    return (config.MUTUAL_COOPERATION_POINTS, config.BETRAYAL_POINTS,
+            config.BETRAYED_POINTS, config.MUTUAL_DEFECTION_POINTS)
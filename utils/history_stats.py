@@ -0,0 +1,65 @@
+from collections import deque
+from utils.moves import Move
+
+class HistoryStats:
+    """Running statistics over a match history, updated in O(1) per round."""
+    def __init__(self, window=3):
+        self.rounds_played = 0
+        self._my_last = None
+        self._opponent_last = None
+        
+        # Totals over the whole match
+        self.my_cooperations = 0
+        self.my_defections = 0
+        self.opponent_cooperations = 0
+        self.opponent_defections = 0
+        self.opponent_has_defected = False
+        
+        # Number of rounds in a row the last move has been repeated
+        self.my_streak = 0
+        self.opponent_streak = 0
+        
+        # The last `window` moves and how many of them were defections
+        self.my_window = deque(maxlen=window)
+        self.opponent_window = deque(maxlen=window)
+        self.my_window_defections = 0
+        self.opponent_window_defections = 0
+
+    def update(self, my_move: Move, opponent_move: Move):
+        """Account for one finished round"""
+        self.rounds_played += 1
+        
+        if my_move == Move.DEFECT:
+            self.my_defections += 1
+        else:
+            self.my_cooperations += 1
+        if opponent_move == Move.DEFECT:
+            self.opponent_defections += 1
+            self.opponent_has_defected = True
+        else:
+            self.opponent_cooperations += 1
+        
+        # Streaks follow the last moves themselves, as a window may hold no moves at all
+        self.my_streak = self.my_streak + 1 if self._my_last == my_move else 1
+        self.opponent_streak = self.opponent_streak + 1 if self._opponent_last == opponent_move else 1
+        self._my_last = my_move
+        self._opponent_last = opponent_move
+        if not self.my_window.maxlen:
+            return
+        
+        # Drop the move that falls out of the window before appending
+        if len(self.my_window) == self.my_window.maxlen:
+            self.my_window_defections -= self.my_window[0] == Move.DEFECT
+            self.opponent_window_defections -= self.opponent_window[0] == Move.DEFECT
+        self.my_window.append(my_move)
+        self.opponent_window.append(opponent_move)
+        self.my_window_defections += my_move == Move.DEFECT
+        self.opponent_window_defections += opponent_move == Move.DEFECT
+
+    @property
+    def my_window_cooperations(self) -> int:
+        return len(self.my_window) - self.my_window_defections
+
+    @property
+    def opponent_window_cooperations(self) -> int:
+        return len(self.opponent_window) - self.opponent_window_defections
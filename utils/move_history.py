@@ -0,0 +1,91 @@
+from collections.abc import Sequence
+from utils.moves import Move
+
+# Move for a stored bit value (a set bit means DEFECT)
+_MOVES = (Move.COOPERATE, Move.DEFECT)
+
+# Byte translation tables that extract one player's bit from each stored round
+_PLAYER_BITS = [bytes((value >> player) & 1 for value in range(256)) for player in range(2)]
+
+class MatchHistory:
+    """Moves of both bots in a match, stored in a single bytearray.
+
+    Each round takes one byte: bit 0 holds bot 1's move and bit 1 holds bot 2's
+    move. Bots read the buffer through HistoryView objects, so nothing is copied.
+    """
+    def __init__(self):
+        self.rounds = bytearray()
+
+    def append(self, move1: Move, move2: Move):
+        """Record one round"""
+        self.rounds.append((move1 is Move.DEFECT) | (move2 is Move.DEFECT) << 1)
+
+    def repeat_cycle(self, start: int, rounds: int):
+        """Extend the history to `rounds` rounds by repeating the rounds from `start` on.
+
+        Returns (mutual cooperation, mutual defection, betrayals by bot 1, betrayals by
+        bot 2) over the added rounds.
+        """
+        cycle = bytes(self.rounds[start:])
+        repeats, partial = divmod(rounds - len(self.rounds), len(cycle))
+        self.rounds.extend(cycle * repeats)
+        self.rounds.extend(cycle[:partial])
+        # Stored values: 0 both cooperate, 1 bot 1 defects, 2 bot 2 defects, 3 both defect
+        counts = [cycle.count(value) * repeats + cycle.count(value, 0, partial) for value in range(4)]
+        return counts[0], counts[3], counts[1], counts[2]
+
+    def view(self, player: int) -> 'HistoryView':
+        """Return the moves of bot 1 (player 0) or bot 2 (player 1) as a sequence"""
+        return HistoryView(self.rounds, player)
+
+    def __len__(self):
+        return len(self.rounds)
+
+
+class HistoryView(Sequence):
+    """Read-only sequence of one player's moves over a shared MatchHistory buffer"""
+    def __init__(self, rounds: bytearray, player: int):
+        self._rounds = rounds
+        self._player = player
+
+    def __len__(self):
+        return len(self._rounds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(map(_MOVES.__getitem__, self._rounds[index].translate(_PLAYER_BITS[self._player])))
+        return _MOVES[(self._rounds[index] >> self._player) & 1]
+
+    def bits(self) -> bytes:
+        """Return one byte per round, 1 where the player defected and 0 otherwise"""
+        return self._rounds.translate(_PLAYER_BITS[self._player])
+
+    def __iter__(self):
+        return map(_MOVES.__getitem__, self.bits())
+
+    def count(self, move: Move) -> int:
+        defections = self.bits().count(1)
+        if move == Move.DEFECT:
+            return defections
+        if move == Move.COOPERATE:
+            return len(self._rounds) - defections
+        return 0
+
+    def copy(self) -> list:
+        return list(self)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, (HistoryView, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
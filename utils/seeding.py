@@ -0,0 +1,22 @@
+import random
+from contextlib import contextmanager
+
+
+def new_tournament_seed() -> int:
+    """Pick a seed for a tournament that was not given one, so it can still be reproduced."""
+    return random.SystemRandom().getrandbits(32)
+
+
+@contextmanager
+def isolated_random(seed):
+    """Seed the global random module for one match and restore its previous state afterwards.
+
+    Bots that call random directly then play the same for a given seed no matter which
+    process plays the match or what was played before it.
+    """
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(state)
@@ -0,0 +1,78 @@
+from collections import namedtuple
+from utils.moves import Move
+
+# A memory-one strategy: the probability of cooperating in the first round and after
+# each outcome of the previous round, named by (own move, opponent's move)
+MemoryOne = namedtuple('MemoryOne', ['first', 'cc', 'cd', 'dc', 'dd'])
+
+class StrategyTable:
+    """A strategy written as a finite-state machine.
+
+    moves[state] is the move played in a state and transitions[state] maps the
+    opponent's move in that round to the next state. Bots that can describe
+    themselves this way are played by the vectorized engine.
+    """
+    def __init__(self, moves, transitions, initial_state=0):
+        self.moves = list(moves)
+        self.transitions = [dict(transition) for transition in transitions]
+        self.initial_state = initial_state
+
+    @classmethod
+    def constant(cls, move: Move) -> 'StrategyTable':
+        """A strategy that always plays the same move"""
+        return cls([move], [{Move.COOPERATE: 0, Move.DEFECT: 0}])
+
+    @classmethod
+    def from_schedule(cls, schedule) -> 'StrategyTable':
+        """A strategy that plays a fixed move for every round, whatever the opponent does.
+
+        State i is round i + 1; the last state repeats for any later rounds.
+        """
+        last = len(schedule) - 1
+        transitions = [{Move.COOPERATE: min(i + 1, last), Move.DEFECT: min(i + 1, last)}
+                       for i in range(len(schedule))]
+        return cls(schedule, transitions)
+
+
+def _defining_class(cls, attribute):
+    for klass in cls.__mro__:
+        if attribute in klass.__dict__:
+            return klass
+    return None
+
+
+def _defined_with_strategy(bot, attribute):
+    # A hook is only trusted if it was defined alongside the strategy in use, so a
+    # subclass that overrides strategy() without redefining the hook falls back to normal play
+    hook_owner = _defining_class(type(bot), attribute)
+    strategy_owner = _defining_class(type(bot), 'strategy')
+    return hook_owner is not None and strategy_owner is not None and issubclass(hook_owner, strategy_owner)
+
+
+def get_strategy_table(bot, rounds: int):
+    """Return the bot's StrategyTable for a match of the given length, or None."""
+    if not _defined_with_strategy(bot, 'strategy_table'):
+        return None
+    return bot.strategy_table(rounds)
+
+
+def get_move_schedule(bot, rounds: int):
+    """Return the bot's list of moves for a match of the given length, or None."""
+    if not _defined_with_strategy(bot, 'move_schedule'):
+        return None
+    schedule = bot.move_schedule(rounds)
+    if schedule is not None and len(schedule) != rounds:
+        raise ValueError(f"{bot.name} returned a move schedule of {len(schedule)} moves for {rounds} rounds")
+    return schedule
+
+
+def get_memory_one(bot):
+    """Return the bot's MemoryOne probabilities, or None."""
+    if not _defined_with_strategy(bot, 'memory_one'):
+        return None
+    return bot.memory_one()
+
+
+def provides_state_key(bot) -> bool:
+    """Whether the bot's state_key() can be trusted to describe the strategy in use."""
+    return _defined_with_strategy(bot, 'state_key')